@@ -1,4 +1,98 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# U.S. Census Bureau Regional Divisions mapping (state abbreviations)
+CENSUS_DIVISIONS = {
+    # New England
+    'ct': 'New England',  # Connecticut
+    'me': 'New England',  # Maine
+    'ma': 'New England',  # Massachusetts
+    'nh': 'New England',  # New Hampshire
+    'ri': 'New England',  # Rhode Island
+    'vt': 'New England',  # Vermont
+    
+    # Middle Atlantic
+    'nj': 'Middle Atlantic',  # New Jersey
+    'ny': 'Middle Atlantic',  # New York
+    'pa': 'Middle Atlantic',  # Pennsylvania
+    
+    # East North Central
+    'il': 'East North Central',  # Illinois
+    'in': 'East North Central',  # Indiana
+    'mi': 'East North Central',  # Michigan
+    'oh': 'East North Central',  # Ohio
+    'wi': 'East North Central',  # Wisconsin
+    
+    # West North Central
+    'ia': 'West North Central',  # Iowa
+    'ks': 'West North Central',  # Kansas
+    'mn': 'West North Central',  # Minnesota
+    'mo': 'West North Central',  # Missouri
+    'ne': 'West North Central',  # Nebraska
+    'nd': 'West North Central',  # North Dakota
+    'sd': 'West North Central',  # South Dakota
+    
+    # South Atlantic
+    'de': 'South Atlantic',  # Delaware
+    'fl': 'South Atlantic',  # Florida
+    'ga': 'South Atlantic',  # Georgia
+    'md': 'South Atlantic',  # Maryland
+    'nc': 'South Atlantic',  # North Carolina
+    'sc': 'South Atlantic',  # South Carolina
+    'va': 'South Atlantic',  # Virginia
+    'wv': 'South Atlantic',  # West Virginia
+    'dc': 'South Atlantic',  # Washington DC
+    
+    # East South Central
+    'al': 'East South Central',  # Alabama
+    'ky': 'East South Central',  # Kentucky
+    'ms': 'East South Central',  # Mississippi
+    'tn': 'East South Central',  # Tennessee
+    
+    # West South Central
+    'ar': 'West South Central',  # Arkansas
+    'la': 'West South Central',  # Louisiana
+    'ok': 'West South Central',  # Oklahoma
+    'tx': 'West South Central',  # Texas
+    
+    # Mountain
+    'az': 'Mountain',  # Arizona
+    'co': 'Mountain',  # Colorado
+    'id': 'Mountain',  # Idaho
+    'mt': 'Mountain',  # Montana
+    'nv': 'Mountain',  # Nevada
+    'nm': 'Mountain',  # New Mexico
+    'ut': 'Mountain',  # Utah
+    'wy': 'Mountain',  # Wyoming
+    
+    # Pacific
+    'ak': 'Pacific',  # Alaska
+    'ca': 'Pacific',  # California
+    'hi': 'Pacific',  # Hawaii
+    'or': 'Pacific',  # Oregon
+    'wa': 'Pacific'   # Washington
+}
+
+# The 9 allowed census divisions
+ALLOWED_REGIONS = frozenset({
+    'New England',
+    'Middle Atlantic',
+    'East North Central',
+    'West North Central',
+    'South Atlantic',
+    'East South Central',
+    'West South Central',
+    'Mountain',
+    'Pacific'
+})
+
+# Same set as an Arrow array, for pc.is_in on pyarrow-backed string columns
+ALLOWED_REGIONS_ARROW = pa.array(sorted(ALLOWED_REGIONS))
+
+
 def add_census_divisions_abbrev(df, state_col='state', new_col='census_region'):
     """
     Add U.S. Census Bureau Regional Divisions based on state abbreviations
@@ -12,94 +106,23 @@ def add_census_divisions_abbrev(df, state_col='state', new_col='census_region'):
     pd.DataFrame: DataFrame with new census division column
     """
     
-    # U.S. Census Bureau Regional Divisions mapping (state abbreviations)
-    census_divisions = {
-        # New England
-        'ct': 'New England',  # Connecticut
-        'me': 'New England',  # Maine
-        'ma': 'New England',  # Massachusetts
-        'nh': 'New England',  # New Hampshire
-        'ri': 'New England',  # Rhode Island
-        'vt': 'New England',  # Vermont
-        
-        # Middle Atlantic
-        'nj': 'Middle Atlantic',  # New Jersey
-        'ny': 'Middle Atlantic',  # New York
-        'pa': 'Middle Atlantic',  # Pennsylvania
-        
-        # East North Central
-        'il': 'East North Central',  # Illinois
-        'in': 'East North Central',  # Indiana
-        'mi': 'East North Central',  # Michigan
-        'oh': 'East North Central',  # Ohio
-        'wi': 'East North Central',  # Wisconsin
-        
-        # West North Central
-        'ia': 'West North Central',  # Iowa
-        'ks': 'West North Central',  # Kansas
-        'mn': 'West North Central',  # Minnesota
-        'mo': 'West North Central',  # Missouri
-        'ne': 'West North Central',  # Nebraska
-        'nd': 'West North Central',  # North Dakota
-        'sd': 'West North Central',  # South Dakota
-        
-        # South Atlantic
-        'de': 'South Atlantic',  # Delaware
-        'fl': 'South Atlantic',  # Florida
-        'ga': 'South Atlantic',  # Georgia
-        'md': 'South Atlantic',  # Maryland
-        'nc': 'South Atlantic',  # North Carolina
-        'sc': 'South Atlantic',  # South Carolina
-        'va': 'South Atlantic',  # Virginia
-        'wv': 'South Atlantic',  # West Virginia
-        'dc': 'South Atlantic',  # Washington DC
-        
-        # East South Central
-        'al': 'East South Central',  # Alabama
-        'ky': 'East South Central',  # Kentucky
-        'ms': 'East South Central',  # Mississippi
-        'tn': 'East South Central',  # Tennessee
-        
-        # West South Central
-        'ar': 'West South Central',  # Arkansas
-        'la': 'West South Central',  # Louisiana
-        'ok': 'West South Central',  # Oklahoma
-        'tx': 'West South Central',  # Texas
-        
-        # Mountain
-        'az': 'Mountain',  # Arizona
-        'co': 'Mountain',  # Colorado
-        'id': 'Mountain',  # Idaho
-        'mt': 'Mountain',  # Montana
-        'nv': 'Mountain',  # Nevada
-        'nm': 'Mountain',  # New Mexico
-        'ut': 'Mountain',  # Utah
-        'wy': 'Mountain',  # Wyoming
-        
-        # Pacific
-        'ak': 'Pacific',  # Alaska
-        'ca': 'Pacific',  # California
-        'hi': 'Pacific',  # Hawaii
-        'or': 'Pacific',  # Oregon
-        'wa': 'Pacific'   # Washington
-    }
-    
-    # Create a copy to avoid modifying original
-    df_with_divisions = df.copy()
-    
-    # Map state abbreviations to census divisions
-    df_with_divisions[new_col] = df_with_divisions[state_col].map(census_divisions)
+    # Map state abbreviations to census divisions. On a categorical state column map
+    # only touches the categories, not every row.
+    df_with_divisions = df.assign(**{new_col: df[state_col].map(CENSUS_DIVISIONS).astype('category')})
     
-    # Check for unmapped states
-    unmapped_states = df_with_divisions[df_with_divisions[new_col].isnull()][state_col].unique()
+    # Check for unmapped states (the missing mask is computed once and reused below)
+    divisions = df_with_divisions[new_col]
+    unmapped_mask = divisions.isna()
+    unmapped_rows = int(unmapped_mask.sum())
+    unmapped_states = df_with_divisions.loc[unmapped_mask, state_col].unique()
     
-    # Summary
+    # Summary (the category count needs no pass over the rows)
     mapping_summary = {
         'total_rows': len(df_with_divisions),
-        'mapped_rows': df_with_divisions[new_col].notna().sum(),
-        'unmapped_rows': df_with_divisions[new_col].isna().sum(),
+        'mapped_rows': len(df_with_divisions) - unmapped_rows,
+        'unmapped_rows': unmapped_rows,
         'unmapped_states': list(unmapped_states),
-        'divisions_found': df_with_divisions[new_col].nunique()
+        'divisions_found': len(divisions.cat.categories)
     }
     
     return df_with_divisions, mapping_summary
@@ -122,36 +145,35 @@ def validate_regions(df, column_name='census_region'):
         Filtered DataFrame and summary dictionary
     """
     
-    # Define the 9 allowed census divisions
-    allowed_regions = {
-        'New England',
-        'Middle Atlantic', 
-        'East North Central',
-        'West North Central',
-        'South Atlantic',
-        'East South Central',
-        'West South Central',
-        'Mountain',
-        'Pacific'
-    }
-    
     original_count = len(df)
     
-    # Create a copy to avoid modifying original dataframe
-    df_clean = df.copy()
-    
-    # Handle missing values and standardize
-    df_clean[column_name] = (df_clean[column_name]
-                            .fillna('unknown')
-                            .astype(str)
-                            .str.strip())
-    
-    # Find valid regions
-    valid_mask = df_clean[column_name].isin(allowed_regions)
-    invalid_regions = df_clean.loc[~valid_mask, column_name].unique().tolist()
-    
-    # Drop rows with invalid regions
-    df_filtered = df_clean[valid_mask].copy()
+    # Standardize whitespace; on a categorical column only the category labels are stripped
+    regions = df[column_name]
+    if isinstance(regions.dtype, pd.CategoricalDtype):
+        stripped = regions.cat.categories.str.strip()
+        regions = (regions.cat.rename_categories(stripped) if stripped.is_unique
+                   else regions.map(str.strip, na_action='ignore'))
+    else:
+        regions = regions.str.strip()
+    
+    # Find valid regions (missing values are reported as 'unknown'). On a categorical
+    # column membership is tested once per category and gathered by code.
+    if isinstance(regions.dtype, pd.CategoricalDtype):
+        valid_categories = np.append(regions.cat.categories.isin(ALLOWED_REGIONS), False)
+        valid_mask = pd.Series(valid_categories[regions.cat.codes.to_numpy()], index=regions.index)
+    elif isinstance(regions.dtype, pd.ArrowDtype) or getattr(regions.dtype, 'storage', None) == 'pyarrow':
+        # Arrow-backed strings are checked with the Arrow kernel, without converting to Python objects
+        valid = pc.is_in(pa.array(regions.array), value_set=ALLOWED_REGIONS_ARROW)
+        valid_mask = pd.Series(valid.to_numpy(zero_copy_only=False), index=regions.index)
+    else:
+        valid_mask = regions.isin(ALLOWED_REGIONS)
+    invalid_regions = (regions[~valid_mask]
+                       .astype(object)
+                       .fillna('unknown')
+                       .unique().tolist())
+    
+    # Drop rows with invalid regions and keep the standardized values
+    df_filtered = df.loc[valid_mask].assign(**{column_name: regions[valid_mask]})
     
     # Create summary
     summary = {
@@ -160,7 +182,7 @@ def validate_regions(df, column_name='census_region'):
         'rows_dropped': original_count - len(df_filtered),
         'invalid_regions_found': invalid_regions,
         'drop_rate_percent': round((original_count - len(df_filtered)) / original_count * 100, 2),
-        'valid_regions': list(allowed_regions)
+        'valid_regions': list(ALLOWED_REGIONS)
     }
     
     return df_filtered, summary
\ No newline at end of file
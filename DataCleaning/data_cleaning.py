@@ -1,5 +1,131 @@
 from typing import Dict
 import pandas as pd
+import numpy as np
+
+
+# Columns not needed for analysis
+DEFAULT_DROP_COLUMNS = (
+    'url', 'image_url', 'county', 'VIN', 'size',
+    'condition', 'posting_date', 'cylinders', 'region', 'region_url'
+)
+
+# Columns known to have very few missing values
+FEW_MISSING_COLUMNS = (
+    'year', 'description', 'fuel', 'odometer',
+    'lat', 'long', 'transmission', 'model', 'manufacturer'
+)
+
+
+def count_codes(codes, categories):
+    """
+    Count categorical codes with np.bincount instead of a value_counts hash pass
+    
+    Parameters:
+    codes (np.ndarray): Category codes (-1 for missing values, which are not counted)
+    categories (array-like): Categories the codes refer to
+    
+    Returns:
+    dict: Non-zero counts per category, most frequent first
+    """
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)), index=categories)
+    return counts[counts > 0].sort_values(ascending=False, kind='stable').to_dict()
+
+
+def fill_missing_column(df, column_name, fill_value):
+    """
+    Fill missing values (NaN/null) in a specific column with a specified value
+    
+    Shared by the column specific fill functions, which only set the defaults.
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    column_name (str): Name of the column to fill missing values
+    fill_value (str/int/float): Value to use for filling missing values
+    
+    Returns:
+    pd.DataFrame: DataFrame with missing values filled in the specified column
+    dict: Summary of missing values before and after filling
+    """
+    
+    # Check if column exists
+    if column_name not in df.columns:
+        raise ValueError(f"Column '{column_name}' not found in DataFrame")
+    
+    # Count missing values before filling
+    missing_before = df[column_name].isnull().sum()
+    
+    # Fill missing values
+    df_filled = df.assign(**{column_name: df[column_name].fillna(fill_value)})
+    
+    # Count missing values after filling
+    missing_after = df_filled[column_name].isnull().sum()
+    
+    # Create summary
+    summary = {
+        'column_name': column_name,
+        'fill_value': fill_value,
+        'missing_before': missing_before,
+        'missing_after': missing_after,
+        'values_filled': missing_before - missing_after,
+        'total_rows': len(df_filled)
+    }
+    
+    return df_filled, summary
+
+
+def validate_membership(df, column, valid_values, collect_stats=True):
+    """
+    Keep only the rows whose column value is one of the valid values
+    
+    The column is converted to category once: the categories are checked against the
+    valid values and the row mask, the value counts and the null count are all read
+    from the same codes.
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    column (str): Name of the column to validate
+    valid_values (tuple): Values to keep
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
+    
+    Returns:
+    pd.DataFrame: Filtered DataFrame with only valid values (null values are dropped as well)
+    dict: Summary of validation results
+    """
+    
+    values = df[column].astype('category')
+    codes = values.cat.codes.to_numpy()
+    categories = values.cat.categories
+    
+    # Missing values have code -1 and pick up the trailing False, so they are never valid
+    valid_mask = np.append(categories.isin(valid_values), False)[codes]
+    valid_df = df[valid_mask]
+    
+    if not collect_stats:
+        return valid_df, None
+    
+    original_count = len(df)
+    
+    # Unused categories of a categorical input are left out of the counts
+    invalid_values = count_codes(codes[~valid_mask], categories)
+    null_count = (codes < 0).sum()
+    
+    # Create summary
+    validation_summary = {
+        'total_rows': original_count,
+        'valid_rows': len(valid_df),
+        'dropped_rows': original_count - len(valid_df),
+        'drop_percentage': round((original_count - len(valid_df)) / original_count * 100, 2),
+        'valid_values': list(valid_values),
+        'original_value_counts': count_codes(codes, categories),
+        'invalid_values': invalid_values,
+        'null_values': null_count,
+        'validation_passed': len(invalid_values) == 0 and null_count == 0
+    }
+    
+    return valid_df, validation_summary
+
+
 def drop_unnecessary_columns(df, columns_to_drop=None):
     """
     Drop columns that are not needed for analysis
@@ -15,21 +141,15 @@ def drop_unnecessary_columns(df, columns_to_drop=None):
     
     # Default columns to drop if none specified
     if columns_to_drop is None:
-        columns_to_drop = [
-            'url', 'image_url', 'county', 'VIN', 'size', 
-            'condition', 'posting_date', 'cylinders','region','region_url'
-        ]
-    
-    # Create a copy to avoid modifying the original DataFrame
-    df_cleaned = df.copy()
+        columns_to_drop = DEFAULT_DROP_COLUMNS
     
     # Check which columns actually exist in the DataFrame
-    existing_columns = [col for col in columns_to_drop if col in df_cleaned.columns]
-    missing_columns = [col for col in columns_to_drop if col not in df_cleaned.columns]
+    present_columns = set(df.columns)
+    existing_columns = [col for col in columns_to_drop if col in present_columns]
+    missing_columns = [col for col in columns_to_drop if col not in present_columns]
     
-    # Drop the existing columns
-    if existing_columns:
-        df_cleaned = df_cleaned.drop(existing_columns, axis=1)
+    # Drop all existing columns in one call
+    df_cleaned = df.drop(columns=existing_columns) if existing_columns else df
     
     # Create summary
     summary = {
@@ -66,29 +186,21 @@ def drop_rows_with_few_missing_values(df, columns_with_few_missing=None):
     
     # Default columns with few missing values if none specified
     if columns_with_few_missing is None:
-        columns_with_few_missing = [
-            'year', 'description', 'fuel', 'odometer', 
-            'lat', 'long', 'transmission', 'model','manufacturer'
-        ]
-    
-    # Create a copy to avoid modifying the original DataFrame
-    df_cleaned = df.copy()
+        columns_with_few_missing = FEW_MISSING_COLUMNS
     
     # Store original info
-    original_count = len(df_cleaned)
+    original_count = len(df)
     
     # Check which columns actually exist in the DataFrame
-    existing_columns = [col for col in columns_with_few_missing if col in df_cleaned.columns]
-    missing_columns = [col for col in columns_with_few_missing if col not in df_cleaned.columns]
+    existing_columns = [col for col in columns_with_few_missing if col in df.columns]
+    missing_columns = [col for col in columns_with_few_missing if col not in df.columns]
     
-    # Count missing values per column before dropping
-    missing_counts = {}
-    for col in existing_columns:
-        missing_counts[col] = df_cleaned[col].isnull().sum()
+    # Count missing values per column before dropping (one reduction over the subframe)
+    subset = df[existing_columns]
+    missing_counts = subset.isna().sum().to_dict()
     
     # Drop rows with missing values in columns with few missing values
-    if existing_columns:
-        df_cleaned = df_cleaned.dropna(subset=existing_columns)
+    df_cleaned = df.loc[subset.notna().all(axis=1)] if existing_columns else df
     
     # Create summary
     summary = {
@@ -103,3 +215,131 @@ def drop_rows_with_few_missing_values(df, columns_with_few_missing=None):
     }
     
     return df_cleaned, summary
+
+
+def convert_to_category(df, columns=None):
+    """
+    Convert low-cardinality string columns to pandas 'category' dtype
+    
+    A categorical column stores every distinct value once plus small integer codes,
+    so later map/isin/value_counts calls work on the codes instead of on Python strings.
+    Convert only once the column values are final: filling a categorical with a value
+    that is not one of its categories raises an error.
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    columns (list): List of column names to convert. If None, uses default columns.
+    
+    Returns:
+    pd.DataFrame: DataFrame with the specified columns converted to category dtype
+    dict: Summary of converted columns
+    """
+    
+    # Default low-cardinality columns if none specified
+    if columns is None:
+        columns = [
+            'state', 'type', 'drive', 'transmission',
+            'title_status', 'paint_color', 'manufacturer'
+        ]
+    
+    # Check which columns actually exist in the DataFrame
+    existing_columns = [col for col in columns if col in df.columns]
+    missing_columns = [col for col in columns if col not in df.columns]
+    
+    # Convert all existing columns in one astype call
+    df_converted = df.astype({col: 'category' for col in existing_columns})
+    
+    # Create summary
+    summary = {
+        'converted_columns': existing_columns,
+        'missing_columns': missing_columns,
+        'category_counts': {col: len(df_converted[col].cat.categories) for col in existing_columns}
+    }
+    
+    return df_converted, summary
+
+
+def remove_unused_categories(df):
+    """
+    Drop the categories no row uses any more from every categorical column
+    
+    Filtering rows keeps the full category list, so values rejected by a validator
+    would otherwise still show up as categories (e.g. with zero counts in value_counts
+    or in a Parquet file written from the frame).
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    
+    Returns:
+    pd.DataFrame: DataFrame with only the observed categories in each categorical column
+    dict: Number of categories removed per categorical column
+    """
+    
+    categorical_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    
+    df_pruned = df.assign(**{col: df[col].cat.remove_unused_categories() for col in categorical_columns})
+    
+    # Create summary
+    summary = {
+        'categorical_columns': categorical_columns,
+        'categories_removed': {
+            col: len(df[col].cat.categories) - len(df_pruned[col].cat.categories)
+            for col in categorical_columns
+        }
+    }
+    
+    return df_pruned, summary
+
+
+def apply_validators(df, validators):
+    """
+    Run several row validators on the same frame and filter the frame only once
+    
+    Each validator is called on a narrow, positionally indexed view holding just the
+    columns it checks, so only those columns are filtered per validator. The full
+    DataFrame is then filtered a single time with the combined mask. Columns a
+    validator standardizes (e.g. stripped or lowercased values) are written back
+    for the kept rows.
+    
+    Every validator sees the same input rows, so a row rejected by two validators
+    is counted in both summaries. Validators whose result depends on the rows kept
+    by an earlier step (e.g. frequency filters) must not be combined this way.
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    validators (list): List of (function, columns, kwargs) tuples. Each function must
+                       follow the validate_* contract of returning (filtered_df, summary)
+                       and may only drop rows or rewrite the listed columns.
+    
+    Returns:
+    pd.DataFrame: DataFrame with only the rows that passed every validator
+    list: Summary dictionary of each validator, in order
+    """
+    
+    original_count = len(df)
+    keep = np.ones(original_count, dtype=bool)
+    validated_columns = {}
+    summaries = []
+    
+    for validate, columns, kwargs in validators:
+        # The positional index lets the kept rows be read straight off the result index
+        df_subset = df[columns].reset_index(drop=True)
+        df_subset_clean, summary = validate(df_subset, **kwargs)
+        
+        passed = np.zeros(original_count, dtype=bool)
+        passed[df_subset_clean.index.to_numpy()] = True
+        keep &= passed
+        
+        for col in columns:
+            validated_columns[col] = df_subset_clean[col]
+        summaries.append(summary)
+    
+    # Filter the full DataFrame once and bring back the validated column values
+    kept_positions = np.flatnonzero(keep)
+    df_valid = df.iloc[kept_positions]
+    df_valid = df_valid.assign(**{
+        col: values.reindex(kept_positions).set_axis(df_valid.index)
+        for col, values in validated_columns.items()
+    })
+    
+    return df_valid, summaries
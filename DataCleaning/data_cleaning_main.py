@@ -1,11 +1,68 @@
-import sys
 import os
 import pandas as pd
 import numpy as np
 
-# Add utility path and import print_summary
-sys.path.append(os.path.join(os.getcwd(), '../'))
 from utility.print_summary import print_summary
+from cloud.gcs_storage_operations import GCSDataOperations
+from DataCleaning.data_census_region import add_census_divisions_abbrev, validate_regions
+from DataCleaning.data_cleaning import (
+    drop_unnecessary_columns,
+    drop_rows_with_few_missing_values,
+    convert_to_category,
+    remove_unused_categories,
+    apply_validators,
+)
+from DataCleaning.data_drive import (
+    clean_drive_column,
+    fill_missing_drive_from_reference,
+    impute_drive_from_type,
+    validate_drive_values,
+)
+from DataCleaning.data_fuel import convert_fuel_to_gas, validate_fuel_values
+from DataCleaning.data_lat_long import validate_usa_coordinates
+from DataCleaning.data_manufacturers import standardize_manufacturer, validate_manufacturers
+from DataCleaning.data_model import (
+    extract_car_data,
+    remove_numerical_models,
+    clean_models_with_list_optimized,
+    filter_by_value_counts,
+    validate_model_frequency,
+)
+from DataCleaning.data_odometer import process_odometer_column, validate_odometer
+from DataCleaning.data_paint_color import fill_paint_color_nulls, validate_paint_color
+from DataCleaning.data_price import clean_price_data
+from DataCleaning.data_state import validate_state
+from DataCleaning.data_title_status import fill_missing_values, validate_title_status_values
+from DataCleaning.data_transmission import (
+    fill_missing_values_transmission,
+    convert_transmission_to_automatic,
+    validate_transmission_values,
+)
+from DataCleaning.data_type import (
+    drop_na_drive_type,
+    replace_values,
+    fill_type_from_model,
+    drop_na_type,
+    validate_type_values,
+)
+from DataCleaning.data_year import validate_years
+
+# Copy-on-write lets the cleaning steps drop their defensive df.copy() calls: they attach
+# columns with df.assign or filter rows, and neither changes the input frame
+pd.set_option("mode.copy_on_write", True)
+
+# Raw columns used by the cleaning steps; the others (urls, VIN, posting_date, ...)
+# are dropped in step 4 anyway, so they are not read from the Parquet file at all
+RAW_COLUMNS = [
+    'id', 'price', 'year', 'manufacturer', 'model', 'cylinders', 'fuel', 'odometer',
+    'title_status', 'transmission', 'drive', 'type', 'paint_color', 'description',
+    'state', 'lat', 'long'
+]
+
+# Model -> drive reference shipped with the repository (data/models_with_drive.csv)
+DRIVE_REFERENCE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'models_with_drive.csv')
+
 
 def main_data_cleaning_pipeline():
     """
@@ -17,190 +74,161 @@ def main_data_cleaning_pipeline():
     GCP_PROJECT_ID = os.getenv('PROJECT_ID')
     GCS_BUCKET_NAME = os.getenv('BUCKET_NAME')
     
+    # Step summaries are only printed, and the validators only build theirs,
+    # when DEAL_IQ_VERBOSE=1
+    verbose = os.getenv('DEAL_IQ_VERBOSE') == '1'
+    report = print_summary if verbose else (lambda summary: None)
+    
     # Step 2: Initialize GCS operations and read raw data
-    from cloud.gcs_storage_operations import GCSDataOperations
     gcs = GCSDataOperations(GCP_PROJECT_ID)
-    df = gcs.read_parquet(GCS_BUCKET_NAME, "raw_data.parquet")
+    df = gcs.read_parquet(GCS_BUCKET_NAME, "raw_data.parquet", columns=RAW_COLUMNS)
     
     # Step 3: Standardization and extracting info from model and description
-    from DataCleaning.data_model import extract_car_data
-    df = extract_car_data(df)
+    # (distinct texts are parsed on all CPUs)
+    df = extract_car_data(df, n_jobs=-1)
     
     # Step 4: Drop unnecessary columns
-    from DataCleaning.data_cleaning import drop_unnecessary_columns, drop_rows_with_few_missing_values
     df, summary = drop_unnecessary_columns(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 5: Drop rows due to high NAs
     df, summary = drop_rows_with_few_missing_values(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 6: Fill missing values in title_status with 'missing'
-    from DataCleaning.data_title_status import fill_missing_values
     df, summary = fill_missing_values(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 7: Fill missing values in transmission
-    from DataCleaning.data_transmission import fill_missing_values_transmission, convert_transmission_to_automatic
     df, summary = fill_missing_values_transmission(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 8: Convert transmission to automatic format
     df, summary = convert_transmission_to_automatic(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 9: Drive column standardization
-    from DataCleaning.data_drive import clean_drive_column
     df, summary = clean_drive_column(df, 'drive')
     
     # Step 10: Fill missing drive values from reference file
-    from DataCleaning.data_drive import fill_missing_drive_from_reference
-    df, summary = fill_missing_drive_from_reference(df,
-                                                   reference_file='/Users/dhruvpatel/Desktop/projects/DealPredection/data/models_with_drive.csv')
-    print_summary(summary)
+    df, summary = fill_missing_drive_from_reference(df, reference_file=DRIVE_REFERENCE_FILE)
+    report(summary)
     
     # Step 11: Remove numerical models (Stage 1 of model cleaning)
-    from DataCleaning.data_model import remove_numerical_models
     df, summary = remove_numerical_models(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 12: Clean models with optimized list (Stage 2 of model cleaning)
-    from DataCleaning.data_model import clean_models_with_list_optimized
     df, summary = clean_models_with_list_optimized(df)
-    print_summary(summary)
+    report(summary)
+    
+    # Step 12a: Model values are final from here on (manufacturers are only renamed in
+    # step 19), so both columns become categorical for the remaining model/manufacturer steps
+    df, summary = convert_to_category(df, columns=['manufacturer', 'model'])
+    report(summary)
     
     # Step 13: Filter models by value counts (minimum 10 occurrences)
-    from DataCleaning.data_model import filter_by_value_counts
     df = filter_by_value_counts(df, 'model', min_count=10)
     
     # Step 14: Drop NA values in drive type
-    from DataCleaning.data_type import drop_na_drive_type
     df, summary = drop_na_drive_type(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 15: Replace and standardize type values (mini van -> minivan)
-    from DataCleaning.data_type import replace_values
     df, summary = replace_values(df, 'type', {'mini van': 'minivan', 'mini-van': 'minivan'})
-    print_summary(summary)
+    report(summary)
     
     # Step 16: Fill type from model information
-    from DataCleaning.data_type import fill_type_from_model
     df, summary = fill_type_from_model(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 17: Drop remaining NA values in type
-    from DataCleaning.data_type import drop_na_type
     df_clean, summary = drop_na_type(df)
-    print_summary(summary)
+    report(summary)
     df = df_clean  # Update df with cleaned version
     
     # Step 18: Impute drive values based on type cross-tabulation
-    from DataCleaning.data_drive import impute_drive_from_type
     df, summary = impute_drive_from_type(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 19: Standardize manufacturer names
-    from DataCleaning.data_manufacturers import standardize_manufacturer
     df, summary = standardize_manufacturer(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 20: Fill paint color null values
-    from DataCleaning.data_paint_color import fill_paint_color_nulls
     df, summary = fill_paint_color_nulls(df)
-    print_summary(summary)
+    report(summary)
+    
+    # Step 20a: Convert low-cardinality columns to category dtype (values are final from here on)
+    df, summary = convert_to_category(df)
+    report(summary)
     
     # Step 21: Add census divisions and regions
-    from DataCleaning.data_census_region import add_census_divisions_abbrev, validate_regions
     df, summary = add_census_divisions_abbrev(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 22: Clean price data
-    from DataCleaning.data_price import clean_price_data
     df, summary = clean_price_data(df, 'price')
-    print_summary(summary)
+    report(summary)
     
     # Step 23: Convert fuel values to gas format
-    from DataCleaning.data_fuel import convert_fuel_to_gas
     df, summary = convert_fuel_to_gas(df)
-    print_summary(summary)
+    report(summary)
     
     # Step 24: Process odometer column
-    from DataCleaning.data_odometer import process_odometer_column
     df, summary = process_odometer_column(df, 'odometer')
-    print_summary(summary)
+    report(summary)
     
     # VALIDATION STEPS - Validate all columns
-    
-    # Step 25: Validate census regions
-    df, summary = validate_regions(df)
-    print_summary(summary)
-    
-    # Step 26: Validate years (minimum year 1990)
-    from DataCleaning.data_year import validate_years
-    df, summary = validate_years(df, year_column='year', min_year=1990)
-    print_summary(summary)
-    
-    # Step 27: Validate transmission values
-    from DataCleaning.data_transmission import validate_transmission_values
-    df, validation_summary = validate_transmission_values(df)
-    print_summary(validation_summary)
-    
-    # Step 28: Validate fuel values
-    from DataCleaning.data_fuel import validate_fuel_values
-    df, summary = validate_fuel_values(df)
-    print_summary(summary)
-    
-    # Step 29: Validate title status values
-    from DataCleaning.data_title_status import validate_title_status_values
-    df, summary = validate_title_status_values(df)
-    print_summary(summary)
-    
-    # Step 30: Validate type values
-    from DataCleaning.data_type import validate_type_values
-    df, summary = validate_type_values(df, standardize_case=True)
-    print_summary(summary)
-    
-    # Step 31: Validate manufacturers
-    from DataCleaning.data_manufacturers import validate_manufacturers
-    df, summary = validate_manufacturers(df)
-    print_summary(summary)
-    
-    # Step 32: Validate paint color
-    from DataCleaning.data_paint_color import validate_paint_color
-    df, summary = validate_paint_color(df)
-    print_summary(summary)
-    
-    # Step 33: Validate state values
-    from DataCleaning.data_state import validate_state
-    df, summary = validate_state(df)
-    print_summary(summary)
+    # Row validators run on the same frame and the frame is filtered once per group
+    # Steps 25-33: Validate census regions, years (minimum year 1990), transmission,
+    # fuel, title status, type, manufacturers, paint color and state values
+    df, summaries = apply_validators(df, [
+        (validate_regions, ['census_region'], {}),
+        (validate_years, ['year'], {'year_column': 'year', 'min_year': 1990, 'collect_stats': verbose}),
+        (validate_transmission_values, ['transmission'], {'collect_stats': verbose}),
+        (validate_fuel_values, ['fuel'], {'collect_stats': verbose}),
+        (validate_title_status_values, ['title_status'], {'collect_stats': verbose}),
+        (validate_type_values, ['type'], {'standardize_case': True, 'collect_stats': verbose}),
+        (validate_manufacturers, ['manufacturer'], {'collect_stats': verbose}),
+        (validate_paint_color, ['paint_color'], {}),
+        (validate_state, ['state'], {}),
+    ])
+    for summary in summaries:
+        report(summary)
+    
+    # Step 33a: Drop the categories of the rows removed by steps 25-33, so the model
+    # frequencies below only cover models that are still in use
+    df, summary = remove_unused_categories(df)
+    report(summary)
     
     # Step 34: Validate model frequency (minimum 10 occurrences)
-    from DataCleaning.data_model import validate_model_frequency
+    # Runs on its own since the counts depend on the rows kept by steps 25-33
     df_clean, summary = validate_model_frequency(df, min_count=10)
-    print_summary(summary)
+    report(summary)
     df = df_clean  # Update df with cleaned version
     
-    # Step 35: Validate drive values
-    from DataCleaning.data_drive import validate_drive_values
-    df, summary = validate_drive_values(df)
-    print_summary(summary)
-    
-    # Step 36: Validate odometer values (0 to 500,000 miles)
-    from DataCleaning.data_odometer import validate_odometer
-    df, summary = validate_odometer(df, min_miles=0, max_miles=500000)
-    print_summary(summary)
-    
-    # Step 37: Validate USA coordinates (latitude and longitude)
-    from DataCleaning.data_lat_long import validate_usa_coordinates
-    df, summary = validate_usa_coordinates(df)
-    print_summary(summary)
+    # Steps 35-37: Validate drive values, odometer values (0 to 500,000 miles)
+    # and USA coordinates (latitude and longitude)
+    df, summaries = apply_validators(df, [
+        (validate_drive_values, ['drive'], {'collect_stats': verbose}),
+        (validate_odometer, ['odometer'], {'min_miles': 0, 'max_miles': 500000}),
+        (validate_usa_coordinates, ['lat', 'long'], {}),
+    ])
+    for summary in summaries:
+        report(summary)
     
     # Final step: Print remaining null values summary
-    print("\nFinal null values summary:")
-    print(df.isna().sum()) 
+    if verbose:
+        print("\nFinal null values summary:")
+        print(df.isna().sum()) 
     
     df.drop(columns=['description','id'], inplace=True)
+    
+    # Drop the categories of the rows removed by steps 34-37 so they are not written
+    # to the Parquet file
+    df, summary = remove_unused_categories(df)
+    report(summary)
 
     # writing clean file to the cloud storage
     gcs.upload_parquet(bucket_name=GCS_BUCKET_NAME,blob_name='clean_data.parquet',df=df)
@@ -1,7 +1,62 @@
 import pandas as pd 
 import numpy as np
 import os
-from typing import Dict
+import hashlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from DataCleaning.data_cleaning import count_codes
+
+
+# Drive type implied by each vehicle type (from the type/drive crosstab analysis)
+TYPE_TO_DRIVE = MappingProxyType({
+    'SUV': '4wd', 'offroad': '4wd', 'pickup': '4wd', 'truck': '4wd', 'other': '4wd', 'wagon': '4wd',
+    'hatchback': 'fwd', 'minivan': 'fwd', 'sedan': 'fwd', 'van': 'fwd',
+    'bus': 'rwd', 'convertible': 'rwd', 'coupe': 'rwd'
+})
+
+# Mapping of drive formats (lowercased and stripped) to the standard values
+DRIVE_MAPPING = MappingProxyType({
+    'allwheeldrive': '4wd',
+    'frontwheeldrive': 'fwd',
+    'rearwheeldrive': 'rwd',
+    'front wheel drive': 'fwd',
+    'all wheel drive': '4wd',
+    'front-wheel drive': 'fwd',
+    'rear-wheel drive': 'rwd',
+    'all-wheel drive': '4wd',
+    '4x4': '4wd',
+    'awd': '4wd',
+    '4d': '4wd',
+    '2d': 'rwd',
+    'fwd': 'fwd',
+    'rwd': 'rwd',
+    '4wd': '4wd'
+})
+
+# Stable short hash of the drive mapping, reported in summaries instead of the mapping itself
+DRIVE_MAPPING_VERSION = hashlib.blake2b(repr(sorted(DRIVE_MAPPING.items())).encode(), digest_size=8).hexdigest()
+
+# Valid drive values
+VALID_DRIVES = ('4wd', 'fwd', 'rwd')
+
+# Basic model -> drive mappings for common models, used when the reference file cannot be loaded
+FALLBACK_MODEL_DRIVES = MappingProxyType({
+    # Common FWD models
+    'civic': 'fwd', 'accord': 'fwd', 'camry': 'fwd', 'corolla': 'fwd',
+    'altima': 'fwd', 'sentra': 'fwd', 'focus': 'fwd', 'fusion': 'fwd',
+    'malibu': 'fwd', 'impala': 'fwd', 'sonata': 'fwd', 'elantra': 'fwd',
+    
+    # Common RWD models
+    'mustang': 'rwd', 'camaro': 'rwd', 'challenger': 'rwd', 'charger': 'rwd',
+    'corvette': 'rwd', '3 series': 'rwd', '5 series': 'rwd', 'c-class': 'rwd',
+    
+    # Common 4WD models
+    'f-150': '4wd', 'silverado': '4wd', 'sierra': '4wd', 'ram 1500': '4wd',
+    'wrangler': '4wd', 'cherokee': '4wd', 'grand cherokee': '4wd',
+    'tahoe': '4wd', 'suburban': '4wd', 'explorer': '4wd'
+})
 
 
 def impute_drive_from_type(df, type_column='type', drive_column='drive'):
@@ -23,24 +78,23 @@ def impute_drive_from_type(df, type_column='type', drive_column='drive'):
     dict: Simple summary
     """
     
-    df_clean = df.copy()
-    
-    # Count missing values before imputation
-    missing_before = df_clean[drive_column].isnull().sum()
+    # Count missing values before imputation (the mask is reused for the imputation)
+    missing_mask = df[drive_column].isna()
+    missing_before = int(missing_mask.sum())
     
-    # Define conditions and corresponding drive types
-    condition_4wd = df_clean[type_column].isin(['SUV', 'offroad', 'pickup', 'truck', 'other', 'wagon'])
-    condition_fwd = df_clean[type_column].isin(['hatchback', 'minivan', 'sedan', 'van'])
-    condition_rwd = df_clean[type_column].isin(['bus', 'convertible', 'coupe'])
+    # Factorize the type of the rows missing a drive into integer codes and look up the
+    # drive once per distinct type (a missing type gets NaN)
+    missing_types = df.loc[missing_mask, type_column]
+    type_codes, type_values = pd.factorize(missing_types)
+    drive_lut = np.append(pd.Index(type_values).map(TYPE_TO_DRIVE).to_numpy(dtype=object), np.nan)
+    imputed_drive = pd.Series(drive_lut[type_codes], index=missing_types.index)
     
     # Apply imputation only to missing values
-    df_clean.loc[(df_clean[drive_column].isnull()) & condition_4wd, drive_column] = '4wd'
-    df_clean.loc[(df_clean[drive_column].isnull()) & condition_fwd, drive_column] = 'fwd'
-    df_clean.loc[(df_clean[drive_column].isnull()) & condition_rwd, drive_column] = 'rwd'
+    df_clean = df.assign(**{drive_column: df[drive_column].fillna(imputed_drive)})
     
     # Count missing values after imputation
-    missing_after = df_clean[drive_column].isnull().sum()
-    values_imputed = missing_before - missing_after
+    values_imputed = int(imputed_drive.notna().sum())
+    missing_after = missing_before - values_imputed
     
     # Create summary
     summary = {
@@ -53,37 +107,45 @@ def impute_drive_from_type(df, type_column='type', drive_column='drive'):
     return df_clean, summary 
 
 
-def standardize_drive_value(value: str) -> str:
+def standardize_drive_values(values) -> np.ndarray:
     """
-    Standardize individual drive values to handle edge cases
+    Standardize drive values to handle edge cases
+    
+    The checks run as vectorized string operations over all values at once. When a
+    value matches several checks the first one wins, in the order listed below.
     
     Parameters:
-    value (str): Drive value to standardize
+    values (array-like): Drive values to standardize
     
     Returns:
-    str: Standardized drive value
+    np.ndarray: Standardized drive values (NaN for missing, empty or 'nan' values,
+                the lowercased value itself if no clear match)
     """
-    if pd.isna(value) or value == 'nan' or value == '':
-        return np.nan
+    # Arrow-backed strings keep the string kernels in C++ (missing values stay missing)
+    values = pd.Series(values).astype('string[pyarrow]')
+    missing = values.isna() | values.isin(['nan', ''])
+    values = values.str.lower().str.strip()
     
-    value = str(value).lower().strip()
+    def contains(*words):
+        mask = np.ones(len(values), dtype=bool)
+        for word in words:
+            mask &= values.str.contains(word, regex=False).to_numpy(dtype=bool, na_value=False)
+        return mask
     
     # Handle common variations
-    if 'all' in value and 'wheel' in value and 'drive' in value:
-        return '4wd'
-    elif 'front' in value and 'wheel' in value and 'drive' in value:
-        return 'fwd'
-    elif 'rear' in value and 'wheel' in value and 'drive' in value:
-        return 'rwd'
-    elif '4wd' in value or '4x4' in value or 'awd' in value:
-        return '4wd'
-    elif 'fwd' in value:
-        return 'fwd'
-    elif 'rwd' in value:
-        return 'rwd'
-    else:
-        # If no clear match, return the original value
-        return value
+    conditions = [
+        missing.to_numpy(dtype=bool, na_value=False),
+        contains('all', 'wheel', 'drive'),
+        contains('front', 'wheel', 'drive'),
+        contains('rear', 'wheel', 'drive'),
+        values.str.contains('4wd|4x4|awd', regex=True).to_numpy(dtype=bool, na_value=False),
+        contains('fwd'),
+        contains('rwd')
+    ]
+    choices = [np.nan, '4wd', 'fwd', 'rwd', '4wd', 'fwd', 'rwd']
+    
+    # If no clear match, keep the value
+    return np.select(conditions, choices, default=values.to_numpy(dtype=object))
 
 
 def clean_drive_column(df: pd.DataFrame, drive_column: str = 'drive'):
@@ -98,49 +160,32 @@ def clean_drive_column(df: pd.DataFrame, drive_column: str = 'drive'):
     pd.DataFrame: DataFrame with cleaned drive column
     dict: Simple summary
     """
-    df_clean = df.copy()
-    
-    # Count original values
-    original_counts = df_clean[drive_column].value_counts().to_dict()
-    
-    # Define the mapping for drive types
-    drive_mapping = {
-        'allwheeldrive': '4wd',
-        'frontwheeldrive': 'fwd',
-        'rearwheeldrive': 'rwd',
-        'front wheel drive': 'fwd',
-        'all wheel drive': '4wd',
-        'front-wheel drive': 'fwd',
-        'rear-wheel drive': 'rwd',
-        'all-wheel drive': '4wd',
-        '4x4': '4wd',
-        'awd': '4wd',
-        '4d': '4wd',
-        '2d': 'rwd',
-        'fwd': 'fwd',
-        'rwd': 'rwd',
-        '4wd': '4wd'
-    }
+    df_clean = df
     
     if drive_column in df_clean.columns:
+        # Clean the distinct values only: the column is converted to category once and
+        # the cleaned labels are broadcast back by code (missing values stay missing)
+        drives = df_clean[drive_column].astype('category')
+        
         # Convert to lowercase and strip whitespace for consistent processing
-        df_clean[drive_column] = df_clean[drive_column].astype(str).str.lower().str.strip()
+        labels = drives.cat.categories.astype('string[pyarrow]').str.lower().str.strip()
         
-        # Apply the mapping
-        df_clean[drive_column] = df_clean[drive_column].replace(drive_mapping)
+        # Apply the mapping as one indexer lookup, keeping the labels it does not cover
+        mapped = labels.map(DRIVE_MAPPING)
+        labels = np.where(mapped.isna(), labels, mapped)
         
         # Handle any remaining variations or edge cases
-        df_clean[drive_column] = df_clean[drive_column].apply(standardize_drive_value)
+        labels = standardize_drive_values(labels)
         
-        # Count new values after cleaning
-        new_counts = df_clean[drive_column].value_counts().to_dict()
+        cleaned = np.append(labels, np.nan)[drives.cat.codes.to_numpy()]
+        df_clean = df.assign(**{drive_column: pd.Series(cleaned, index=df.index, dtype=object)})
         
         # Create summary
         summary = {
             'total_rows': len(df_clean),
-            'original_unique_values': len(original_counts),
-            'new_unique_values': len(new_counts),
-            'mappings_applied': drive_mapping
+            'original_unique_values': len(drives.cat.categories),
+            'new_unique_values': pd.Series(labels).nunique(),
+            'mappings_version': DRIVE_MAPPING_VERSION
         }
         
     else:
@@ -153,36 +198,41 @@ def clean_drive_column(df: pd.DataFrame, drive_column: str = 'drive'):
     return df_clean, summary
 
 
-def validate_drive_values(df: pd.DataFrame, drive_column: str = 'drive'):
+def validate_drive_values(df: pd.DataFrame, drive_column: str = 'drive', collect_stats: bool = True):
     """
     Validate drive column to keep only valid values (4wd, fwd, rwd)
     
     Parameters:
     df (pd.DataFrame): Input DataFrame
     drive_column (str): Name of drive column
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
     
     Returns:
     pd.DataFrame: DataFrame with only valid drive values
     dict: Simple summary
     """
     
-    # Valid drive values
-    valid_drives = ['4wd', 'fwd', 'rwd']
+    # Flag the valid drives
+    codes = pd.Categorical(df[drive_column], categories=VALID_DRIVES).codes
+    valid_mask = codes >= 0
     
-    original_rows = len(df)
+    # Keep only valid values (including NaN)
+    df_clean = df[valid_mask | df[drive_column].isna().to_numpy()]
     
-    # Find invalid values
-    invalid_mask = ~df[drive_column].isin(valid_drives)
-    invalid_count = invalid_mask.sum()
+    if not collect_stats:
+        return df_clean, None
     
-    # Keep only valid values (including NaN)
-    df_clean = df[df[drive_column].isin(valid_drives) | df[drive_column].isna()]
+    original_rows = len(df)
+    
+    # Find invalid values (missing values count as not valid, as before)
+    invalid_count = int((~valid_mask).sum())
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
     
-    # Get value counts for summary
-    value_counts = df_clean[drive_column].value_counts().to_dict()
+    # Get value counts for summary straight from the codes of the kept valid values
+    value_counts = count_codes(codes, VALID_DRIVES)
     
     # Create summary
     summary = {
@@ -190,23 +240,104 @@ def validate_drive_values(df: pd.DataFrame, drive_column: str = 'drive'):
         'final_rows': final_rows,
         'rows_dropped': rows_dropped,
         'invalid_values': invalid_count,
-        'valid_drives': valid_drives,
+        'valid_drives': list(VALID_DRIVES),
         'value_counts': value_counts
     }
     
     return df_clean, summary
 
 
+def _fill_drive_from_mapping(df, model_drive_mapping, model_column, drive_column):
+    """
+    Fill missing drive values by exact match of the cleaned model name in a model -> drive mapping
+    
+    Parameters:
+    df (pd.DataFrame): DataFrame containing model and drive columns
+    model_drive_mapping (dict): Mapping of lowercased, stripped model names to drive values
+    model_column (str): Name of the model column
+    drive_column (str): Name of the drive column
+    
+    Returns:
+    pd.DataFrame: DataFrame with filled drive values
+    int: Number of drive values filled
+    int: Number of rows with a model that is not in the mapping
+    """
+    
+    # Models of the rows with missing drive values and a known model, selected with one bulk null mask
+    mask = df[drive_column].isna() & df[model_column].notna()
+    models = df.loc[mask, model_column]
+    
+    # Clean and look up each distinct model once, then broadcast the result back by code
+    model_codes, unique_models = pd.factorize(models)
+    unique_drives = pd.Index(unique_models).astype('string[pyarrow]').str.lower().str.strip().map(model_drive_mapping)
+    matched_drive = pd.Series(unique_drives.to_numpy(dtype=object)[model_codes], index=models.index)
+    filled_count = int(matched_drive.notna().sum())
+    
+    df_filled = df.assign(**{drive_column: df[drive_column].fillna(matched_drive)})
+    
+    return df_filled, filled_count, len(matched_drive) - filled_count
+
+
+@lru_cache(maxsize=4)
+def _load_model_drive_mapping(gcp_project_id: str, gcs_bucket_name: str,
+                              reference_file: str) -> Optional[Mapping[str, str]]:
+    """
+    Load the model -> drive mapping from a reference CSV file, either a local file or
+    a file in Google Cloud Storage
+    
+    Results are cached per (project, bucket, file), so repeated calls skip the download,
+    parsing and normalization. Errors are raised and not cached.
+    
+    Parameters:
+    gcp_project_id (str): GCP project ID (not used for a local file)
+    gcs_bucket_name (str): Name of the GCS bucket (not used for a local file)
+    reference_file (str): Path of a local reference CSV file, or name of the reference CSV file in the bucket
+    
+    Returns:
+    Mapping: Read-only mapping of lowercased, stripped model names to drive values,
+             None if the file has no 'model' and 'drive' columns
+    """
+    # Reference data is parsed by the multithreaded pyarrow CSV reader into Arrow-backed columns
+    if os.path.isfile(reference_file):
+        reference_df = pd.read_csv(reference_file, engine='pyarrow', dtype_backend='pyarrow')
+        print(f"✓ Successfully loaded reference data from local file: {reference_file}")
+    else:
+        from cloud.gcs_storage_operations import GCSDataOperations
+        
+        # Initialize GCS operations and read reference data from GCS
+        gcs = GCSDataOperations(gcp_project_id)
+        reference_df = gcs.read_csv(gcs_bucket_name, reference_file, engine='pyarrow', dtype_backend='pyarrow')
+        print(f"✓ Successfully loaded reference data from GCS: {reference_file}")
+    
+    print(f"  Reference data shape: {reference_df.shape}")
+    
+    # Check if required columns exist in reference file
+    if 'model' not in reference_df.columns or 'drive' not in reference_df.columns:
+        return None
+    
+    # Clean and standardize the reference data (lower/strip run as Arrow string kernels)
+    models = reference_df['model'].astype('string[pyarrow]').str.lower().str.strip()
+    drives = reference_df['drive'].astype('string[pyarrow]').str.lower().str.strip()
+    
+    # Remove duplicates from reference data (keep first occurrence)
+    keep = ~models.duplicated(keep='first')
+    
+    # Create a mapping dictionary for faster lookup, read-only since it is shared between calls
+    return MappingProxyType(dict(zip(models[keep], drives[keep])))
+
+
 def fill_missing_drive_from_reference(df: pd.DataFrame, 
                                     reference_file: str = 'models_with_drive.csv',
                                     model_column: str = 'model',
                                     drive_column: str = 'drive'):
     """
-    Fill missing drive values by matching model names with a reference CSV file from Google Cloud Storage
+    Fill missing drive values by matching model names with a reference CSV file, read from
+    a local path if the file exists there and from Google Cloud Storage otherwise
     
     Parameters:
     df (pd.DataFrame): DataFrame containing model and drive columns
-    reference_file (str): Name of the reference CSV file in GCS bucket (default: 'models_with_drive.csv')
+    reference_file (str): Path of a local reference CSV file, or name of the reference CSV file
+                          in the GCS bucket (default: 'models_with_drive.csv')
     model_column (str): Name of the model column (default: 'model')
     drive_column (str): Name of the drive column (default: 'drive')
     
@@ -214,20 +345,18 @@ def fill_missing_drive_from_reference(df: pd.DataFrame,
     pd.DataFrame: DataFrame with filled drive values
     dict: Simple summary
     """
-    df_clean = df.copy()
+    df_clean = df
     
     # Count missing values before filling
     missing_before = df_clean[drive_column].isna().sum()
     
     try:
-        # Load the reference data from Google Cloud Storage
-        from cloud.gcs_storage_operations import GCSDataOperations
-        
         # Get environment variables for GCS operations
         gcp_project_id = os.getenv('PROJECT_ID') or os.getenv('GCP_PROJECT_ID')
         gcs_bucket_name = os.getenv('BUCKET_NAME') or os.getenv('GCS_BUCKET_NAME')
         
-        if not gcp_project_id or not gcs_bucket_name:
+        # GCS settings are only needed when the reference file is not a local file
+        if not os.path.isfile(reference_file) and (not gcp_project_id or not gcs_bucket_name):
             summary = {
                 'total_rows': len(df_clean),
                 'missing_before': missing_before,
@@ -237,17 +366,11 @@ def fill_missing_drive_from_reference(df: pd.DataFrame,
             }
             return df_clean, summary
         
-        # Initialize GCS operations
-        gcs = GCSDataOperations(gcp_project_id)
-        
-        # Read reference data from GCS
-        reference_df = gcs.read_csv(gcs_bucket_name, reference_file)
-        
-        print(f"✓ Successfully loaded reference data from GCS: {reference_file}")
-        print(f"  Reference data shape: {reference_df.shape}")
+        # Load the reference data from Google Cloud Storage (cached across calls)
+        model_drive_mapping = _load_model_drive_mapping(gcp_project_id, gcs_bucket_name, reference_file)
         
         # Check if required columns exist in reference file
-        if 'model' not in reference_df.columns or 'drive' not in reference_df.columns:
+        if model_drive_mapping is None:
             summary = {
                 'total_rows': len(df_clean),
                 'missing_before': missing_before,
@@ -257,21 +380,8 @@ def fill_missing_drive_from_reference(df: pd.DataFrame,
             }
             return df_clean, summary
         
-        # Clean and standardize the reference data
-        reference_df['model'] = reference_df['model'].astype(str).str.lower().str.strip()
-        reference_df['drive'] = reference_df['drive'].astype(str).str.lower().str.strip()
-        
-        # Remove duplicates from reference data (keep first occurrence)
-        reference_df = reference_df.drop_duplicates(subset=['model'], keep='first')
-        
-        # Create a mapping dictionary for faster lookup
-        model_drive_mapping = dict(zip(reference_df['model'], reference_df['drive']))
-        
         print(f"  Created model-drive mapping with {len(model_drive_mapping)} entries")
         
-        # Find rows with missing drive values
-        missing_drive_mask = df_clean[drive_column].isna()
-        
         if missing_before == 0:
             summary = {
                 'total_rows': len(df_clean),
@@ -283,22 +393,8 @@ def fill_missing_drive_from_reference(df: pd.DataFrame,
             return df_clean, summary
         
         # Process rows with missing drive values
-        filled_count = 0
-        not_found_count = 0
-        
-        for idx in df_clean[missing_drive_mask].index:
-            model_value = df_clean.at[idx, model_column]
-            
-            if pd.notna(model_value):
-                # Clean the model value for matching
-                model_clean = str(model_value).lower().strip()
-                
-                # Try exact match
-                if model_clean in model_drive_mapping:
-                    df_clean.at[idx, drive_column] = model_drive_mapping[model_clean]
-                    filled_count += 1
-                else:
-                    not_found_count += 1
+        df_clean, filled_count, not_found_count = _fill_drive_from_mapping(
+            df_clean, model_drive_mapping, model_column, drive_column)
         
         # Count missing values after filling
         missing_after = df_clean[drive_column].isna().sum()
@@ -322,36 +418,9 @@ def fill_missing_drive_from_reference(df: pd.DataFrame,
         # If GCS fails, try to provide some basic model-drive mappings as fallback
         print("Using fallback model-drive mappings...")
         
-        # Basic fallback mappings for common models
-        fallback_mappings = {
-            # Common FWD models
-            'civic': 'fwd', 'accord': 'fwd', 'camry': 'fwd', 'corolla': 'fwd',
-            'altima': 'fwd', 'sentra': 'fwd', 'focus': 'fwd', 'fusion': 'fwd',
-            'malibu': 'fwd', 'impala': 'fwd', 'sonata': 'fwd', 'elantra': 'fwd',
-            
-            # Common RWD models
-            'mustang': 'rwd', 'camaro': 'rwd', 'challenger': 'rwd', 'charger': 'rwd',
-            'corvette': 'rwd', '3 series': 'rwd', '5 series': 'rwd', 'c-class': 'rwd',
-            
-            # Common 4WD models
-            'f-150': '4wd', 'silverado': '4wd', 'sierra': '4wd', 'ram 1500': '4wd',
-            'wrangler': '4wd', 'cherokee': '4wd', 'grand cherokee': '4wd',
-            'tahoe': '4wd', 'suburban': '4wd', 'explorer': '4wd'
-        }
-        
         # Apply fallback mappings
-        filled_count = 0
-        missing_drive_mask = df_clean[drive_column].isna()
-        
-        for idx in df_clean[missing_drive_mask].index:
-            model_value = df_clean.at[idx, model_column]
-            
-            if pd.notna(model_value):
-                model_clean = str(model_value).lower().strip()
-                
-                if model_clean in fallback_mappings:
-                    df_clean.at[idx, drive_column] = fallback_mappings[model_clean]
-                    filled_count += 1
+        df_clean, filled_count, _ = _fill_drive_from_mapping(
+            df_clean, FALLBACK_MODEL_DRIVES, model_column, drive_column)
         
         missing_after = df_clean[drive_column].isna().sum()
         
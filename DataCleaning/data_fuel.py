@@ -1,4 +1,13 @@
 import pandas as pd 
+import numpy as np
+
+from DataCleaning.data_cleaning import count_codes, validate_membership
+
+
+# Valid fuel values
+VALID_FUELS = ('gas', 'diesel', 'hybrid', 'electric')
+
+
 def convert_fuel_to_gas(df, fuel_col='fuel'):
     """
     Convert all fuel values except 'diesel', 'hybrid', 'electric' to 'gas'
@@ -8,35 +17,34 @@ def convert_fuel_to_gas(df, fuel_col='fuel'):
     fuel_col (str): Name of the fuel column
     
     Returns:
-    pd.DataFrame: DataFrame with standardized fuel values
+    pd.DataFrame: DataFrame with standardized fuel values (category dtype)
     dict: Summary of conversion results
     """
     
-    # Make a copy to avoid modifying original
-    df_converted = df.copy()
+    # Work on the distinct values only: the column is converted to category once
+    fuels = df[fuel_col].astype('category')
+    codes = fuels.cat.codes.to_numpy()
     
-    # Store original values for summary
-    original_values = df_converted[fuel_col].value_counts().to_dict()
+    # Store original values for summary, counted straight from the codes
+    # (unused categories of a categorical input are left out)
+    original_values = count_codes(codes, fuels.cat.categories)
     
     # Valid fuel types (except gas, which is the default)
     valid_non_gas = ['diesel', 'hybrid', 'electric']
     
-    # Convert values: keep valid ones, convert others to 'gas'
-    def standardize_fuel(value):
-        if pd.isna(value):
-            return 'gas'
-        
-        clean_value = str(value).lower().strip()
-        
-        if clean_value in valid_non_gas:
-            return clean_value
-        else:
-            return 'gas'
+    # Convert values: keep valid ones, convert others (missing values included) to 'gas'
+    labels = fuels.cat.categories.astype('string[pyarrow]').str.lower().str.strip()
+    standardized = np.append(np.where(labels.isin(valid_non_gas), labels, 'gas'), 'gas')
     
-    df_converted[fuel_col] = df_converted[fuel_col].apply(standardize_fuel)
+    # Standardized labels can repeat, so re-code them and gather the new codes per row
+    label_codes, new_categories = pd.factorize(standardized)
+    new_codes = label_codes[codes]
+    converted = pd.Categorical.from_codes(new_codes, categories=new_categories)
     
-    # New values for summary
-    new_values = df_converted[fuel_col].value_counts().to_dict()
+    df_converted = df.assign(**{fuel_col: pd.Series(converted, index=df.index)})
+    
+    # New values for summary, from the new codes (categories that no row maps to are left out)
+    new_values = count_codes(new_codes, new_categories)
     
     # Create summary
     conversion_summary = {
@@ -52,51 +60,18 @@ def convert_fuel_to_gas(df, fuel_col='fuel'):
     return df_converted, conversion_summary
 
 
-def validate_fuel_values(df, fuel_col='fuel'):
+def validate_fuel_values(df, fuel_col='fuel', collect_stats=True):
     """
     Validate that fuel column contains only 'gas', 'diesel', 'hybrid', 'electric'
     
     Parameters:
     df (pd.DataFrame): Input DataFrame
     fuel_col (str): Name of the fuel column
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
     
     Returns:
     pd.DataFrame: Filtered DataFrame with only valid fuel values
     dict: Summary of validation results
     """
-    
-    # Valid fuel values
-    valid_values = ['gas', 'diesel', 'hybrid', 'electric']
-    
-    # Store original info
-    original_count = len(df)
-    original_values = df[fuel_col].value_counts().to_dict()
-    
-    # Find invalid values
-    invalid_mask = ~df[fuel_col].isin(valid_values)
-    invalid_values = df[invalid_mask][fuel_col].value_counts().to_dict()
-    
-    # Check for null values
-    null_count = df[fuel_col].isnull().sum()
-    
-    # Filter DataFrame to keep only valid values
-    valid_df = df[df[fuel_col].isin(valid_values)].copy()
-    
-    # Remove null values as well
-    valid_df = valid_df[valid_df[fuel_col].notna()].copy()
-    
-    # Create summary
-    validation_summary = {
-        'total_rows': original_count,
-        'valid_rows': len(valid_df),
-        'dropped_rows': original_count - len(valid_df),
-        'drop_percentage': round((original_count - len(valid_df)) / original_count * 100, 2),
-        'valid_values': valid_values,
-        'original_value_counts': original_values,
-        'invalid_values': invalid_values,
-        'null_values': null_count,
-        'validation_passed': len(invalid_values) == 0 and null_count == 0
-    }
-    
-    return valid_df, validation_summary
-
+    return validate_membership(df, fuel_col, VALID_FUELS, collect_stats)
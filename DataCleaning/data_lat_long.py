@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 
 def validate_usa_coordinates(df, lat_column='lat', long_column='long'):
@@ -25,22 +26,28 @@ def validate_usa_coordinates(df, lat_column='lat', long_column='long'):
     
     original_rows = len(df)
     
-    # Find invalid coordinates (outside USA bounds)
-    invalid_lat = (df[lat_column] < min_lat) | (df[lat_column] > max_lat)
-    invalid_long = (df[long_column] < min_long) | (df[long_column] > max_long)
-    invalid_mask = invalid_lat | invalid_long
-    invalid_count = invalid_mask.sum()
+    # Work on plain float arrays (missing values as NaN) and compare each column once
+    lat = df[lat_column].to_numpy(dtype=float, na_value=np.nan)
+    long = df[long_column].to_numpy(dtype=float, na_value=np.nan)
+    lat_nan = np.isnan(lat)
+    long_nan = np.isnan(long)
     
-    # Keep only valid coordinates (within USA bounds or NaN)
-    valid_coords = (
-        ((df[lat_column] >= min_lat) & (df[lat_column] <= max_lat)) &
-        ((df[long_column] >= min_long) & (df[long_column] <= max_long))
-    )
+    # Bounds masks are combined in place to avoid temporary boolean arrays
+    lat_in_bounds = lat >= min_lat
+    lat_in_bounds &= lat <= max_lat
+    long_in_bounds = long >= min_long
+    long_in_bounds &= long <= max_long
     
-    # Also keep rows where both are NaN
-    both_nan = df[lat_column].isna() & df[long_column].isna()
+    # Keep only valid coordinates (within USA bounds), and rows where both are NaN
+    keep = lat_in_bounds & long_in_bounds
+    keep |= lat_nan & long_nan
     
-    df_clean = df[valid_coords | both_nan]
+    # Find invalid coordinates (present but outside USA bounds)
+    no_invalid = lat_in_bounds | lat_nan
+    no_invalid &= long_in_bounds | long_nan
+    invalid_count = original_rows - int(no_invalid.sum())
+    
+    df_clean = df[keep]
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
@@ -1,4 +1,28 @@
 import pandas as pd
+import numpy as np
+
+from DataCleaning.data_cleaning import validate_membership
+
+
+# Manufacturer name variations and their standard form
+MANUFACTURER_REPLACEMENTS = {
+    'land rover': 'land-rover',
+    'rover': 'land-rover'
+}
+
+# Valid manufacturers list
+VALID_MANUFACTURERS = (
+    'acura', 'alfa-romeo', 'am-general', 'amc', 'audi', 'bentley', 'bmw', 
+    'buick', 'cadillac', 'chevrolet', 'chrysler', 'dodge', 'eagle', 'ferrari', 
+    'fiat', 'ford', 'freightliner', 'geo', 'gmc', 'hino', 'honda', 'hyundai', 
+    'infiniti', 'international', 'isuzu', 'jaguar', 'jeep', 'kaiser', 'kenworth', 
+    'kia', 'lamborghini', 'land-rover', 'lexus', 'lincoln', 'lotus', 'maserati', 
+    'mazda', 'mclaren', 'mercedes-benz', 'mercury', 'mg', 'mini', 'mitsubishi', 
+    'nash', 'nissan', 'oldsmobile', 'packard', 'peterbilt', 'plymouth', 'polaris', 
+    'pontiac', 'porsche', 'ram', 'rolls-royce', 'saab', 'saturn', 'smart', 
+    'sterling', 'studebaker', 'subaru', 'suzuki', 'tesla', 'toyota', 'triumph', 
+    'volkswagen', 'volvo', 'vpg', 'western-star', 'willys','edsel','genesis','datsun'
+)
 
 
 def standardize_manufacturer(df, manufacturer_column='manufacturer'):
@@ -14,80 +38,72 @@ def standardize_manufacturer(df, manufacturer_column='manufacturer'):
     dict: Simple summary
     """
     
-    df_clean = df.copy()
-    
-    # Define replacements
-    replacements = {
-        'land rover': 'land-rover',
-        'rover': 'land-rover',
-        'land rover': 'land-rover'  
-    }
-    
-    # Count affected rows before replacement
-    affected_rows = 0
-    for old_value in replacements.keys():
-        affected_rows += (df_clean[manufacturer_column] == old_value).sum()
-    
-    # Do the replacement
-    df_clean[manufacturer_column] = df_clean[manufacturer_column].replace(replacements)
+    manufacturers = df[manufacturer_column]
+    
+    if isinstance(manufacturers.dtype, pd.CategoricalDtype):
+        # Categorical input: replace the categories only and re-code the rows (a renamed
+        # category can coincide with an existing one, so the codes are rebuilt)
+        codes = manufacturers.cat.codes.to_numpy()
+        categories = manufacturers.cat.categories
+        
+        affected_rows = int(np.append(categories.isin(list(MANUFACTURER_REPLACEMENTS)), False)[codes].sum())
+        
+        mapped = categories.map(MANUFACTURER_REPLACEMENTS)
+        label_codes, new_categories = pd.factorize(np.where(mapped.isna(), categories, mapped))
+        standardized = pd.Series(
+            pd.Categorical.from_codes(np.append(label_codes, -1)[codes], categories=new_categories),
+            index=manufacturers.index
+        )
+    else:
+        # Find affected rows with one membership pass instead of one comparison per variation
+        affected_mask = manufacturers.isin(list(MANUFACTURER_REPLACEMENTS))
+        affected_rows = int(affected_mask.sum())
+        
+        # Do the replacement: only the affected rows are looked up in the dict
+        standardized = manufacturers.mask(affected_mask, manufacturers[affected_mask].map(MANUFACTURER_REPLACEMENTS))
+    
+    df_clean = df.assign(**{manufacturer_column: standardized})
     
     # Create summary
     summary = {
         'total_rows': len(df_clean),
         'rows_changed': affected_rows,
-        'replacements': replacements
+        'replacements': MANUFACTURER_REPLACEMENTS
     }
     
     return df_clean, summary 
 
 
 
-def validate_manufacturers(df, manufacturer_column='manufacturer'):
+def validate_manufacturers(df, manufacturer_column='manufacturer', collect_stats=True):
     """
     Validate and filter DataFrame to keep only rows with approved manufacturers
     
     Parameters:
     df (pd.DataFrame): Input DataFrame
     manufacturer_column (str): Name of the manufacturer column
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
     
     Returns:
     pd.DataFrame: Filtered DataFrame with only valid manufacturers
     dict: Summary of validation results
     """
     
-    # Valid manufacturers list
-    valid_manufacturers = [
-        'acura', 'alfa-romeo', 'am-general', 'amc', 'audi', 'bentley', 'bmw', 
-        'buick', 'cadillac', 'chevrolet', 'chrysler', 'dodge', 'eagle', 'ferrari', 
-        'fiat', 'ford', 'freightliner', 'geo', 'gmc', 'hino', 'honda', 'hyundai', 
-        'infiniti', 'international', 'isuzu', 'jaguar', 'jeep', 'kaiser', 'kenworth', 
-        'kia', 'lamborghini', 'land-rover', 'lexus', 'lincoln', 'lotus', 'maserati', 
-        'mazda', 'mclaren', 'mercedes-benz', 'mercury', 'mg', 'mini', 'mitsubishi', 
-        'nash', 'nissan', 'oldsmobile', 'packard', 'peterbilt', 'plymouth', 'polaris', 
-        'pontiac', 'porsche', 'ram', 'rolls-royce', 'saab', 'saturn', 'smart', 
-        'sterling', 'studebaker', 'subaru', 'suzuki', 'tesla', 'toyota', 'triumph', 
-        'volkswagen', 'volvo', 'vpg', 'western-star', 'willys','edsel','genesis','datsun'
-    ]
-    
-    # Store original info
-    original_count = len(df)
-    original_manufacturers = df[manufacturer_column].value_counts()
-    
-    # Find invalid manufacturers
-    invalid_manufacturers = df[~df[manufacturer_column].isin(valid_manufacturers)][manufacturer_column].value_counts()
+    filtered_df, summary = validate_membership(df, manufacturer_column, VALID_MANUFACTURERS, collect_stats)
     
-    # Filter DataFrame
-    filtered_df = df[df[manufacturer_column].isin(valid_manufacturers)].copy()
+    if summary is None:
+        return filtered_df, None
     
     # Create summary
     validation_summary = {
-        'original_rows': original_count,
-        'filtered_rows': len(filtered_df),
-        'dropped_rows': original_count - len(filtered_df),
-        'drop_percentage': round((original_count - len(filtered_df)) / original_count * 100, 2),
-        'valid_manufacturers_count': len(valid_manufacturers),
-        'found_manufacturers_count': len(original_manufacturers),
-        'invalid_manufacturers': dict(invalid_manufacturers)
+        'original_rows': summary['total_rows'],
+        'filtered_rows': summary['valid_rows'],
+        'dropped_rows': summary['dropped_rows'],
+        'drop_percentage': summary['drop_percentage'],
+        'valid_manufacturers_count': len(VALID_MANUFACTURERS),
+        'found_manufacturers_count': len(summary['original_value_counts']),
+        'invalid_manufacturers': summary['invalid_values']
     }
     
-    return filtered_df, validation_summary
\ No newline at end of file
+    return filtered_df, validation_summary
@@ -1,19 +1,267 @@
 import pandas as pd
 import re
 import os
+import difflib
 import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from tqdm.auto import tqdm
 import numpy as np 
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import Dict, Optional, Union
 
 
+# Patterns used by extract_car_data, compiled once at import
+# Year (4-digit number, typically 1900-2030)
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
 
-def extract_car_data(df: pd.DataFrame) -> pd.DataFrame:
+# Cylinders (number followed by 'cyl', 'cylinder', or 'cylinders'), tried in order
+CYLINDER_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:cyl|cylinder|cylinders?)\b', re.IGNORECASE),
+    re.compile(r'\b(\d+)(?:\s*|-)?(?:cyl|cylinder|cylinders?)\b', re.IGNORECASE)
+]
+
+# Drive types, tried in order (the first pattern that matches anywhere wins)
+DRIVE_PATTERNS = [
+    re.compile(r'\b(4d|4wd|awd|all.?wheel.?drive|4x4)\b', re.IGNORECASE),
+    re.compile(r'\b(2d|rwd|rear.?wheel.?drive)\b', re.IGNORECASE),
+    re.compile(r'\b(fwd|front.?wheel.?drive)\b', re.IGNORECASE)
+]
+
+# Vehicle types
+TYPE_PATTERN = re.compile(
+    r'\b(sedan|coupe|suv|hatchback|wagon|convertible|pickup|truck|van|mini.?van|minivan|offroad|bus)\b',
+    re.IGNORECASE
+)
+
+
+# Mapping dictionaries for standardizing the extracted drive and type values
+EXTRACTED_DRIVE_MAPPING = {
+    '4d': '4wd', '4wd': '4wd', 'awd': '4wd','4x4': '4wd',
+    '2d': 'rwd', 'rwd': 'rwd', 'rear': 'rwd',
+    'fwd': 'fwd', 'front': 'fwd'
+}
+
+EXTRACTED_TYPE_MAPPING = {
+    'sedan': 'sedan', 'coupe': 'coupe', 'suv': 'SUV',
+    'hatchback': 'hatchback', 'wagon': 'wagon', 'convertible': 'convertible',
+    'pickup': 'pickup', 'truck': 'truck', 'van': 'van',
+    'mini-van': 'mini-van', 'minivan': 'mini-van',
+    'offroad': 'offroad', 'bus': 'bus'
+}
+
+
+@lru_cache(maxsize=4)
+def _compile_manufacturer_lookups(manufacturers: tuple):
+    """
+    Compile the manufacturer lookups used by extract_car_data
+    
+    Results are cached per manufacturers list, so repeated calls skip the compilation.
+    
+    Parameters:
+    manufacturers (tuple): Manufacturer names
+    
+    Returns:
+    re.Pattern: Alternation of all multi-word manufacturers, None if there are none
+    list: (manufacturer, compiled pattern) pairs of the multi-word manufacturers, longest first
+    dict: Single-word manufacturers by lowercased name (the first one listed wins)
+    """
+    # Multi-word manufacturers (longest first to avoid partial matches); space and
+    # hyphen separators both match
+    multi_word_manufacturers = [m for m in manufacturers if ' ' in m or '-' in m]
+    multi_word_manufacturers.sort(key=len, reverse=True)
+    
+    manufacturer_patterns = [manufacturer.replace('-', '[-\\s]') for manufacturer in multi_word_manufacturers]
+    multi_word_patterns = [
+        (manufacturer, re.compile(rf'\b{manufacturer_pattern}\b', re.IGNORECASE))
+        for manufacturer, manufacturer_pattern in zip(multi_word_manufacturers, manufacturer_patterns)
+    ]
+    
+    # Matches wherever any of the patterns above matches
+    any_multi_word_pattern = None
+    if manufacturer_patterns:
+        any_multi_word_pattern = re.compile(rf"\b(?:{'|'.join(manufacturer_patterns)})\b", re.IGNORECASE)
+    
+    single_word_manufacturers = {}
+    for manufacturer in manufacturers:
+        if ' ' not in manufacturer and '-' not in manufacturer:
+            single_word_manufacturers.setdefault(manufacturer.lower(), manufacturer)
+    
+    return any_multi_word_pattern, multi_word_patterns, single_word_manufacturers
+
+
+def _parse_string(text_to_parse: str, manufacturers: tuple) -> Dict[str, Optional[Union[str, int]]]:
+    """Parse individual string and extract components, matching manufacturers against the given names"""
+    any_multi_word_pattern, multi_word_patterns, single_word_manufacturers = \
+        _compile_manufacturer_lookups(manufacturers)
+    
+    if pd.isna(text_to_parse) or text_to_parse == '':
+        return {'manufacturer': None, 'type': None, 'drive': None, 'cylinders': None, 'year': None}
+    
+    text_str = str(text_to_parse).strip()
+    extracted: Dict[str, Optional[Union[str, int]]] = {
+        'manufacturer': None, 
+        'type': None, 
+        'drive': None, 
+        'cylinders': None, 
+        'year': None
+    }
+    
+    # Extract year (4-digit number, typically 1900-2030)
+    year_match = YEAR_PATTERN.search(text_str)
+    if year_match:
+        extracted['year'] = int(year_match.group())
+    
+    # Extract cylinders (number followed by 'cyl', 'cylinder', or 'cylinders')
+    for pattern in CYLINDER_PATTERNS:
+        cyl_match = pattern.search(text_str)
+        if cyl_match:
+            cyl_count = cyl_match.group(1)
+            extracted['cylinders'] = f"{cyl_count} cylinders"
+            break
+    
+    # Extract drive type
+    for pattern in DRIVE_PATTERNS:
+        drive_match = pattern.search(text_str)
+        if drive_match:
+            drive_found = drive_match.group(1).lower().replace('-', '').replace(' ', '')
+            extracted['drive'] = EXTRACTED_DRIVE_MAPPING.get(drive_found, drive_found)
+            break
+    
+    # Extract type
+    type_match = TYPE_PATTERN.search(text_str)
+    if type_match:
+        type_found = type_match.group(1).lower().replace('-', '')
+        extracted['type'] = EXTRACTED_TYPE_MAPPING.get(type_found, type_found)
+    
+    # Extract manufacturer (check for multi-word manufacturers first, then single words)
+    model_lower = text_str.lower()
+    
+    # First check for multi-word manufacturers (longer names first to avoid partial matches).
+    # One scan with the combined pattern rules out most strings before the ordered loop
+    if any_multi_word_pattern is not None and any_multi_word_pattern.search(model_lower):
+        for manufacturer, manufacturer_pattern in multi_word_patterns:
+            if manufacturer_pattern.search(model_lower):
+                extracted['manufacturer'] = manufacturer
+                break
+    
+    # If no multi-word manufacturer found, check single words
+    if not extracted['manufacturer']:
+        for word in text_str.split():
+            manufacturer = single_word_manufacturers.get(word.lower().strip())
+            if manufacturer:
+                extracted['manufacturer'] = manufacturer
+                break
+    
+    return extracted
+
+
+# Misspelled manufacturers in model texts (e.g. cheverolet) are matched when a word of at
+# least FUZZY_MIN_WORD_LENGTH letters is this similar (difflib ratio) to a single-word manufacturer
+FUZZY_MANUFACTURER_CUTOFF = 0.9
+FUZZY_MIN_WORD_LENGTH = 5
+
+
+@lru_cache(maxsize=65536)
+def _closest_manufacturer(word: str, manufacturers: tuple) -> Optional[str]:
+    """Single-word manufacturer closest to a lowercase word, None if none is similar enough"""
+    single_word_manufacturers = _compile_manufacturer_lookups(manufacturers)[2]
+    matches = difflib.get_close_matches(word, list(single_word_manufacturers), n=1,
+                                        cutoff=FUZZY_MANUFACTURER_CUTOFF)
+    return single_word_manufacturers[matches[0]] if matches else None
+
+
+def _fuzzy_manufacturer(text_to_parse: str, manufacturers: tuple) -> Optional[str]:
+    """Manufacturer of the first word of the text that is a close misspelling of one, if any"""
+    if pd.isna(text_to_parse):
+        return None
+    
+    for word in str(text_to_parse).lower().split():
+        if len(word) >= FUZZY_MIN_WORD_LENGTH and word.isalpha():
+            manufacturer = _closest_manufacturer(word, manufacturers)
+            if manufacturer:
+                return manufacturer
+    
+    return None
+
+
+# Fewest distinct texts for which extract_car_data parses in worker processes;
+# below this the process start-up costs more than it saves
+PARALLEL_PARSE_MIN_TEXTS = 20000
+
+
+def _parse_texts(texts, manufacturers: tuple, n_jobs: int = 1) -> list:
+    """
+    Parse many strings, in worker processes when n_jobs allows it and there are enough of them
+    
+    Parameters:
+    texts (list-like): Strings to parse
+    manufacturers (tuple): Manufacturer names
+    n_jobs (int): Number of worker processes (-1 or None for one per CPU, 1 to parse in this process)
+    
+    Returns:
+    list: Extracted components of each string, in the same order
+    """
+    max_workers = (os.cpu_count() or 1) if n_jobs in (None, -1) else n_jobs
+    
+    if max_workers <= 1 or len(texts) < PARALLEL_PARSE_MIN_TEXTS:
+        return [_parse_string(text, manufacturers) for text in texts]
+    
+    chunksize = max(1, len(texts) // (max_workers * 4))
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(_parse_string, manufacturers=manufacturers), texts, chunksize=chunksize))
+
+
+# Basic manufacturers list used by extract_car_data when the GCS list cannot be read
+FALLBACK_MANUFACTURERS = (
+    'toyota', 'honda', 'ford', 'chevrolet', 'nissan', 'bmw', 'mercedes-benz',
+    'audi', 'volkswagen', 'hyundai', 'kia', 'mazda', 'subaru', 'lexus',
+    'acura', 'infiniti', 'cadillac', 'buick', 'gmc', 'jeep', 'ram', 'dodge',
+    'chrysler', 'lincoln', 'volvo', 'jaguar', 'land rover', 'porsche',
+    'tesla', 'mitsubishi', 'suzuki', 'isuzu', 'saab', 'pontiac', 'saturn',
+    'oldsmobile', 'mercury', 'plymouth', 'geo', 'eagle', 'daewoo', 'scion'
+)
+
+
+@lru_cache(maxsize=1)
+def _load_manufacturers() -> tuple:
+    """
+    Read the manufacturers list (manufacturers_list.csv) from Google Cloud Storage
+    
+    The list is cached, so it is downloaded once per process. Failures raise and are not
+    cached, so a later call tries again.
+    
+    Returns:
+    tuple: Manufacturer names
+    """
+    from cloud.gcs_storage_operations import GCSDataOperations
+    
+    # Get environment variables for GCS operations
+    gcp_project_id = os.getenv('PROJECT_ID') or os.getenv('GCP_PROJECT_ID')
+    gcs_bucket_name = os.getenv('BUCKET_NAME') or os.getenv('GCS_BUCKET_NAME')
+    
+    if not gcp_project_id or not gcs_bucket_name:
+        raise ValueError("GCP_PROJECT_ID and GCS_BUCKET_NAME environment variables must be set")
+    
+    # Initialize GCS operations
+    gcs = GCSDataOperations(gcp_project_id)
+    
+    # Read manufacturers list from GCS
+    manufacturers_df = gcs.read_csv(gcs_bucket_name, "manufacturers_list.csv")
+    return tuple(manufacturers_df['manufacturer'].tolist())
+
+
+def extract_car_data(df: pd.DataFrame, n_jobs: int = 1) -> pd.DataFrame:
     """
     Extract and organize car data from the 'model' and 'description' columns
+    
+    Each distinct text is parsed once. With n_jobs other than 1 (-1 for one process
+    per CPU), large sets of distinct texts are parsed in worker processes. Rows whose
+    texts name no manufacturer get one from a close misspelling in the model text.
     """
-    # Make a copy to avoid modifying the original dataframe
-    df_clean = df.copy()
+    df_clean = df
     
     # Define possible values for validation
     # drive_options = [np.nan, 'rwd', '4wd', 'fwd']
@@ -22,188 +270,90 @@ def extract_car_data(df: pd.DataFrame) -> pd.DataFrame:
     # cylinder_options = ['8 cylinders', '6 cylinders', np.nan, '4 cylinders', 
     #                    '5 cylinders', 'other', '3 cylinders', '10 cylinders', '12 cylinders']
     
-    # Create mapping dictionaries for standardization
-    drive_mapping = {
-        '4d': '4wd', '4wd': '4wd', 'awd': '4wd','4x4': '4wd',
-        '2d': 'rwd', 'rwd': 'rwd', 'rear': 'rwd',
-        'fwd': 'fwd', 'front': 'fwd'
-    }
-    
-    type_mapping = {
-        'sedan': 'sedan', 'coupe': 'coupe', 'suv': 'SUV',
-        'hatchback': 'hatchback', 'wagon': 'wagon', 'convertible': 'convertible',
-        'pickup': 'pickup', 'truck': 'truck', 'van': 'van',
-        'mini-van': 'mini-van', 'minivan': 'mini-van',
-        'offroad': 'offroad', 'bus': 'bus'
-    }
-     # Read manufacturers list from Google Cloud Storage
+    # Read manufacturers list from Google Cloud Storage (once per process)
     try:
-        from cloud.gcs_storage_operations import GCSDataOperations
-        
-        # Get environment variables for GCS operations
-        gcp_project_id = os.getenv('PROJECT_ID') or os.getenv('GCP_PROJECT_ID')
-        gcs_bucket_name = os.getenv('BUCKET_NAME') or os.getenv('GCS_BUCKET_NAME')
-        
-        if not gcp_project_id or not gcs_bucket_name:
-            raise ValueError("GCP_PROJECT_ID and GCS_BUCKET_NAME environment variables must be set")
-        
-        # Initialize GCS operations
-        gcs = GCSDataOperations(gcp_project_id)
-        
-        # Read manufacturers list from GCS
-        manufacturers_df = gcs.read_csv(gcs_bucket_name, "manufacturers_list.csv")
-        manufacturers = manufacturers_df['manufacturer'].tolist()
-        
+        manufacturers = _load_manufacturers()
         print(f"✓ Successfully loaded {len(manufacturers)} manufacturers from GCS")
         
     except Exception as e:
         print(f"Warning: Could not load manufacturers from GCS: {e}")
         print("Using fallback manufacturers list...")
         # Fallback to a basic manufacturers list if GCS read fails
-        manufacturers = [
-            'toyota', 'honda', 'ford', 'chevrolet', 'nissan', 'bmw', 'mercedes-benz',
-            'audi', 'volkswagen', 'hyundai', 'kia', 'mazda', 'subaru', 'lexus',
-            'acura', 'infiniti', 'cadillac', 'buick', 'gmc', 'jeep', 'ram', 'dodge',
-            'chrysler', 'lincoln', 'volvo', 'jaguar', 'land rover', 'porsche',
-            'tesla', 'mitsubishi', 'suzuki', 'isuzu', 'saab', 'pontiac', 'saturn',
-            'oldsmobile', 'mercury', 'plymouth', 'geo', 'eagle', 'daewoo', 'scion'
-        ]
-    # Common car manufacturers for identification
-    
-    
-    def parse_string(text_to_parse: str) -> Dict[str, Optional[Union[str, int]]]:
-        """Parse individual string and extract components"""
-        if pd.isna(text_to_parse) or text_to_parse == '':
-            return {'manufacturer': None, 'type': None, 'drive': None, 'cylinders': None, 'year': None}
-        
-        text_str = str(text_to_parse).strip()
-        extracted: Dict[str, Optional[Union[str, int]]] = {
-            'manufacturer': None, 
-            'type': None, 
-            'drive': None, 
-            'cylinders': None, 
-            'year': None
-        }
-        
-        # Extract year (4-digit number, typically 1900-2030)
-        year_match = re.search(r'\b(19|20)\d{2}\b', text_str)
-        if year_match:
-            extracted['year'] = int(year_match.group())
-        
-        # Extract cylinders (number followed by 'cyl', 'cylinder', or 'cylinders')
-        cyl_patterns = [
-            r'(\d+)\s*(?:cyl|cylinder|cylinders?)\b',
-            r'\b(\d+)(?:\s*|-)?(?:cyl|cylinder|cylinders?)\b'
-        ]
-        for pattern in cyl_patterns:
-            cyl_match = re.search(pattern, text_str, re.IGNORECASE)
-            if cyl_match:
-                cyl_count = cyl_match.group(1)
-                extracted['cylinders'] = f"{cyl_count} cylinders"
-                break
-        
-        # Extract drive type
-        drive_patterns = [
-            r'\b(4d|4wd|awd|all.?wheel.?drive|4x4)\b',
-            r'\b(2d|rwd|rear.?wheel.?drive)\b',
-            r'\b(fwd|front.?wheel.?drive)\b'
-        ]
-        for pattern in drive_patterns:
-            drive_match = re.search(pattern, text_str, re.IGNORECASE)
-            if drive_match:
-                drive_found = drive_match.group(1).lower().replace('-', '').replace(' ', '')
-                extracted['drive'] = drive_mapping.get(drive_found, drive_found)
-                break
-        
-        # Extract type
-        type_patterns = [
-            r'\b(sedan|coupe|suv|hatchback|wagon|convertible|pickup|truck|van|mini.?van|minivan|offroad|bus)\b'
-        ]
-        for pattern in type_patterns:
-            type_match = re.search(pattern, text_str, re.IGNORECASE)
-            if type_match:
-                type_found = type_match.group(1).lower().replace('-', '')
-                extracted['type'] = type_mapping.get(type_found, type_found)
-                break
-        
-        # Extract manufacturer (check for multi-word manufacturers first, then single words)
-        model_lower = text_str.lower()
-        
-        # First check for multi-word manufacturers (longer names first to avoid partial matches)
-        multi_word_manufacturers = [m for m in manufacturers if ' ' in m or '-' in m]
-        # Sort by length (longest first) to avoid partial matches
-        multi_word_manufacturers.sort(key=len, reverse=True)
-        
-        for manufacturer in multi_word_manufacturers:
-            # Handle both space and hyphen separators
-            manufacturer_pattern = manufacturer.replace('-', '[-\\s]')
-            if re.search(rf'\b{manufacturer_pattern}\b', model_lower, re.IGNORECASE):
-                extracted['manufacturer'] = manufacturer
-                break
-        
-        # If no multi-word manufacturer found, check single words
-        if not extracted['manufacturer']:
-            words = text_str.split()
-            for word in words:
-                word_clean = word.lower().strip()
-                for manufacturer in manufacturers:
-                    # Only check single-word manufacturers
-                    if ' ' not in manufacturer and '-' not in manufacturer:
-                        if word_clean == manufacturer.lower():
-                            extracted['manufacturer'] = manufacturer
-                            break
-                if extracted['manufacturer']:
-                    break
-        
-        return extracted
+        manufacturers = FALLBACK_MANUFACTURERS
     
     # Initialize columns if they don't exist
     required_columns = ['manufacturer', 'type', 'drive', 'cylinders', 'year']
-    for col in required_columns:
-        if col not in df_clean.columns:
-            df_clean[col] = np.nan
-    
-    # Process each row
-    for idx, row in df_clean.iterrows():
-        # Process 'model' then 'description' to fill in missing details
-        for source_col in ['model', 'description']:
-            if source_col in df_clean.columns and pd.notna(row[source_col]):
-                extracted_data = parse_string(row[source_col])
-                
-                # Fill missing data only if the current value is NaN or empty
-                for field, value in extracted_data.items():
-                    if value is not None:
-                        current_value = df_clean.at[idx, field]
-                        if pd.isna(current_value) or str(current_value).strip() == '' or str(current_value).lower() == 'nan':
-                            df_clean.at[idx, field] = value
+    df_clean = df_clean.assign(**{col: np.nan for col in required_columns if col not in df_clean.columns})
+    
+    # Parse each distinct 'model' and 'description' string once, then broadcast the
+    # extracted values back to the rows by code (None for rows without the source text)
+    extracted = {field: np.full(len(df_clean), None, dtype=object) for field in required_columns}
     
-    return df_clean  
+    # Process 'model' then 'description': a value extracted from the model wins
+    for source_col in ['model', 'description']:
+        if source_col not in df_clean.columns:
+            continue
+        
+        codes, unique_texts = pd.factorize(df_clean[source_col])
+        parsed = _parse_texts(list(unique_texts), manufacturers, n_jobs)
+        
+        for field in required_columns:
+            source_values = np.array([values[field] for values in parsed] + [None], dtype=object)[codes]
+            missing = pd.isna(extracted[field])
+            extracted[field][missing] = source_values[missing]
+    
+    # Rows still without a manufacturer: accept a close misspelling in the model text. This
+    # runs last so exact matches in the description win over fuzzy matches in the model
+    missing = pd.isna(extracted['manufacturer'])
+    if 'model' in df_clean.columns and missing.any():
+        codes, unique_texts = pd.factorize(df_clean['model'][missing])
+        fuzzy_manufacturers = [_fuzzy_manufacturer(text, manufacturers) for text in unique_texts]
+        extracted['manufacturer'][missing] = np.array(fuzzy_manufacturers + [None], dtype=object)[codes]
+    
+    # Fill missing data only if the current value is NaN or empty
+    filled_columns = {}
+    for field in required_columns:
+        current = df_clean[field]
+        current_str = current.astype('string[pyarrow]')
+        is_empty = (current.isna()
+                    | current_str.str.strip().eq('').fillna(False)
+                    | current_str.str.lower().eq('nan').fillna(False)).to_numpy(dtype=bool)
+        
+        fill_mask = is_empty & pd.notna(extracted[field])
+        if fill_mask.any():
+            # Keep the column dtype where the extracted values fit it (e.g. years in a float column)
+            fill_values = pd.Series(extracted[field], index=current.index)
+            try:
+                fill_values = fill_values.astype(current.dtype)
+            except (TypeError, ValueError):
+                pass
+            filled_columns[field] = current.mask(fill_mask, fill_values)
+    
+    return df_clean.assign(**filled_columns)
 
 def clean_and_validate_data(df: pd.DataFrame) -> pd.DataFrame:
     """Additional cleaning and validation"""
-    df_clean = df.copy()
+    df_clean = df
+    cleaned_columns = {}
     
     # Standardize drive values
     drive_mapping = {'4d': '4wd', '2d': 'rwd'}
     if 'drive' in df_clean.columns:
-        df_clean['drive'] = df_clean['drive'].replace(drive_mapping)
+        # Only the affected rows are looked up in the dict
+        drives = df_clean['drive']
+        affected_mask = drives.isin(list(drive_mapping))
+        cleaned_columns['drive'] = drives.mask(affected_mask, drives[affected_mask].map(drive_mapping))
     
     # Ensure cylinders format is consistent
     if 'cylinders' in df_clean.columns:
-        def format_cylinders(val: Union[str, float, int, None]) -> Union[str, float, None]:
-            if pd.isna(val):
-                return val
-            val_str = str(val).lower()
-            # Extract number from various formats
-            match = re.search(r'(\d+)', val_str)
-            if match:
-                num = match.group(1)
-                return f"{num} cylinders"
-            return val
-        
-        df_clean['cylinders'] = df_clean['cylinders'].apply(format_cylinders)
-    
-    return df_clean
+        # Extract number from various formats in one vectorized pass; values without
+        # a number (and missing values) are kept as they are
+        cylinders = df_clean['cylinders']
+        numbers = cylinders.astype('string[pyarrow]').str.extract(r'(\d+)', expand=False)
+        has_number = numbers.notna().to_numpy(dtype=bool)
+        cleaned_columns['cylinders'] = cylinders.mask(has_number, numbers + ' cylinders')
+    
+    return df_clean.assign(**cleaned_columns)
 
 def process_car_dataset(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -229,6 +379,27 @@ def process_car_dataset(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
+def _code_counts(values):
+    """
+    Code a column once and count the codes with np.bincount
+    
+    Parameters:
+    values (pd.Series): Column to count (categorical columns reuse their codes)
+    
+    Returns:
+    np.ndarray: Code per row (-1 for missing values)
+    np.ndarray: Occurrences per code (zero for unused categories)
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        value_count = len(values.cat.categories)
+    else:
+        codes, uniques = pd.factorize(values)
+        value_count = len(uniques)
+    
+    return codes, np.bincount(codes[codes >= 0], minlength=value_count)
+
+
 def validate_model_frequency(df, model_column='model', min_count=10):
     """
     Keep only models that appear at least min_count times in the dataset
@@ -245,18 +416,18 @@ def validate_model_frequency(df, model_column='model', min_count=10):
     
     original_rows = len(df)
     
-    # Get value counts for models
-    model_counts = df[model_column].value_counts()
+    # Code the models once and get their counts straight from the codes; unused
+    # categories of a categorical column are counted with zero occurrences, as value_counts does
+    codes, model_counts = _code_counts(df[model_column])
     
     # Find models that appear at least min_count times
-    frequent_models = model_counts[model_counts >= min_count].index
+    frequent_models = model_counts >= min_count
     
     # Count models that don't meet the threshold
-    infrequent_models = model_counts[model_counts < min_count]
-    infrequent_count = infrequent_models.sum()
+    infrequent_count = model_counts[~frequent_models].sum()
     
-    # Keep only rows with frequent models (including NaN)
-    df_clean = df[df[model_column].isin(frequent_models) | df[model_column].isna()]
+    # Keep only rows with frequent models (missing models are kept)
+    df_clean = df[np.append(frequent_models, True)[codes]]
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
@@ -267,8 +438,8 @@ def validate_model_frequency(df, model_column='model', min_count=10):
         'final_rows': final_rows,
         'rows_dropped': rows_dropped,
         'min_count_threshold': min_count,
-        'models_kept': len(frequent_models),
-        'models_dropped': len(infrequent_models),
+        'models_kept': int(frequent_models.sum()),
+        'models_dropped': int((~frequent_models).sum()),
         'infrequent_model_rows': infrequent_count
     }
     
@@ -292,7 +463,7 @@ def remove_numerical_models(df: pd.DataFrame, model_column: str = 'model'):
     pd.DataFrame: DataFrame with problematic rows removed
     dict: Simple summary
     """
-    df_clean = df.copy()
+    df_clean = df
     
     if model_column not in df_clean.columns:
         print(f"Warning: Column '{model_column}' not found in DataFrame")
@@ -306,12 +477,15 @@ def remove_numerical_models(df: pd.DataFrame, model_column: str = 'model'):
     # Get the total number of rows before cleaning
     total_rows_before = len(df_clean)
     
-    # Create masks to identify rows to remove (vectorized operations)
+    # Create masks to identify rows to remove (vectorized operations on one Arrow-backed
+    # string column; missing models are never removed)
+    models = df_clean[model_column].astype('string[pyarrow]')
+    
     # 1. Rows with only numerical values in model column
-    numerical_mask = df_clean[model_column].astype(str).str.match(r'^\d+$', na=False)
+    numerical_mask = models.str.match(r'^\d+$').to_numpy(dtype=bool, na_value=False)
     
     # 2. Rows with length more than 40 characters
-    length_mask = df_clean[model_column].astype(str).str.len() > 40
+    length_mask = (models.str.len() > 40).to_numpy(dtype=bool, na_value=False)
     
     # Combine masks to get rows to remove
     rows_to_remove = numerical_mask | length_mask
@@ -341,10 +515,14 @@ def remove_numerical_models(df: pd.DataFrame, model_column: str = 'model'):
     }
     
     return df_clean, summary
+@lru_cache(maxsize=1)
 def _load_models_by_manufacturer():
     """
     Load model lists from data/models.py and organize them by manufacturer.
     
+    The result is cached, so data/models.py is executed once per process. It is shared
+    between calls and must not be modified.
+    
     Returns:
         dict: A dictionary where keys are manufacturers and values are lists of models.
     """
@@ -382,6 +560,64 @@ def _load_models_by_manufacturer():
         
     return models_by_manufacturer
 
+# A lowercase letter followed by a digit, where model names get a space inserted (f150 -> f 150)
+LETTER_DIGIT_PATTERN = re.compile(r'([a-z])(\d)')
+
+@lru_cache(maxsize=1)
+def _build_model_lookup_tables():
+    """
+    Build the model lookup tables used by clean_models_with_list_optimized from the
+    models in data/models.py.
+    
+    The tables are cached, so they are built once per process. They are shared between
+    calls and must not be modified.
+    
+    Returns:
+        dict: Exact matches, normalized variation -> (model, manufacturer).
+        dict: Contains matches, normalized variation -> [(model, manufacturer), ...], longer models first.
+        dict: Priority of each normalized variation (longer matches first, ties in insertion order).
+        int: Number of words in the longest normalized variation.
+    """
+    models_by_manufacturer = _load_models_by_manufacturer()
+    
+    # Direct lookup for exact matches
+    exact_match_dict = {}
+    contains_match_dict = {}
+    
+    # Normalize every model and its spaced letter/digit form (f150 -> f 150) in one batch
+    models = [(manufacturer, model) for manufacturer, models in models_by_manufacturer.items() for model in models]
+    normalized_models = _normalize_texts(
+        [text for _, model in models for text in (model, LETTER_DIGIT_PATTERN.sub(r'\1 \2', model))]
+    )
+    
+    for index, (manufacturer, model) in enumerate(models):
+        normalized_model, normalized_spaced = normalized_models[2 * index:2 * index + 2]
+        
+        # Separator variants (f-150, f 150, f_150) normalize to the same key, so each model
+        # needs at most three keys: as written, spaced and without separators (f150)
+        for normalized_variation in dict.fromkeys(
+            (normalized_model, normalized_spaced, normalized_model.replace(' ', ''))
+        ):
+            if normalized_variation:
+                # Store for exact matches
+                exact_match_dict[normalized_variation] = (model, manufacturer)
+                
+                # Store for contains matches (sorted by length desc for priority)
+                if normalized_variation not in contains_match_dict:
+                    contains_match_dict[normalized_variation] = []
+                contains_match_dict[normalized_variation].append((model, manufacturer))
+    
+    # Sort contains matches by length (longer matches first)
+    for key in contains_match_dict:
+        contains_match_dict[key] = sorted(contains_match_dict[key], key=lambda x: len(x[0]), reverse=True)
+    
+    # Priority of each model variation: longer matches first, ties in insertion order
+    sorted_variations = sorted(contains_match_dict.keys(), key=len, reverse=True)
+    variation_rank = {model_variation: rank for rank, model_variation in enumerate(sorted_variations)}
+    max_variation_words = max((len(v.split()) for v in sorted_variations), default=0)
+    
+    return exact_match_dict, contains_match_dict, variation_rank, max_variation_words
+
 def _normalize_text(text):
     """
     Normalize text for better matching by:
@@ -406,32 +642,71 @@ def _normalize_text(text):
     
     return text
 
-def _create_model_variations(model):
+# Runs of whitespace, hyphens and underscores for the Arrow (RE2) kernels. RE2's \\s only covers
+# ASCII whitespace, so the class lists every character Python's \\s (str.isspace) matches
+SEPARATOR_RUN_PATTERN = (
+    r'[\t\n\x0b\x0c\r\x1c-\x1f \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}'
+    r'\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}\-_]+'
+)
+
+def _normalize_texts(texts):
     """
-    Create variations of a model name to handle different formats:
-    - Original: f150
-    - With hyphen: f-150
-    - With space: f 150
-    - Without spaces/hyphens: f150
+    Normalize many texts at once, with the same result as _normalize_text for each of them
+    
+    The steps run as Arrow compute kernels over the whole batch instead of as Python
+    regex calls per text.
+    
+    Args:
+        texts (list-like): Texts to normalize (missing values are not allowed).
+    
+    Returns:
+        list: Normalized texts, in the same order.
     """
-    variations = set()
+    # Convert to string and lowercase
+    normalized = pc.utf8_lower(pa.array(pd.Series(texts, dtype=object).astype('string[pyarrow]').array))
+    
+    # Replace multiple spaces, hyphens, underscores with single space
+    normalized = pc.replace_substring_regex(normalized, SEPARATOR_RUN_PATTERN, ' ')
+    
+    # Remove special characters except letters, numbers, and spaces
+    normalized = pc.replace_substring_regex(normalized, r'[^a-z0-9 ]', '')
     
-    # Original model
-    variations.add(model)
+    # Remove extra spaces
+    normalized = pc.utf8_trim(pc.replace_substring_regex(normalized, r' {2,}', ' '), characters=' ')
     
-    # Create normalized version (no spaces, hyphens, underscores)
-    normalized = re.sub(r'[\s\-_]+', '', model)
-    variations.add(normalized)
+    return normalized.to_pylist()
+
+def _best_variation(words, variation_rank, max_words, prefix_only=False):
+    """
+    Find the highest-priority model variation made of consecutive words of a normalized text
     
-    # Add version with hyphens between letters and numbers
-    hyphen_version = re.sub(r'([a-z])(\d)', r'\1-\2', model)
-    variations.add(hyphen_version)
+    Normalized texts and variations only hold [a-z0-9] words separated by single spaces, so a
+    variation matches the text on word boundaries exactly when it equals a run of its words.
+    Looking up each run in a dict replaces one regex search per known variation.
     
-    # Add version with spaces between letters and numbers
-    space_version = re.sub(r'([a-z])(\d)', r'\1 \2', model)
-    variations.add(space_version)
+    Args:
+        words (list): Words of the normalized text.
+        variation_rank (dict): Priority of each variation (lower is better).
+        max_words (int): Number of words in the longest variation.
+        prefix_only (bool, optional): Only consider runs that start at the first word and
+            are followed by another word. Defaults to False.
     
-    return variations
+    Returns:
+        str: The best matching variation, or None if no variation matches.
+    """
+    best_variation, best_rank = None, None
+    starts = range(1) if prefix_only else range(len(words))
+    
+    for start in starts:
+        # A prefix match must leave at least one word after the variation
+        stop = min(len(words) - 1 if prefix_only else len(words), start + max_words)
+        for end in range(start + 1, stop + 1):
+            candidate = ' '.join(words[start:end])
+            rank = variation_rank.get(candidate)
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best_variation, best_rank = candidate, rank
+    
+    return best_variation
 
 def filter_by_value_counts(df, column, min_count=1):
     """
@@ -446,12 +721,11 @@ def filter_by_value_counts(df, column, min_count=1):
     Returns:
     pd.DataFrame: Filtered DataFrame
     """
-    # Get values that appear at least min_count times
-    frequent_values = df[column].value_counts()
-    frequent_values = frequent_values[frequent_values >= min_count].index
+    # Get values that appear at least min_count times, counted straight from the codes
+    codes, value_counts = _code_counts(df[column])
     
-    # Keep only rows with frequently occurring values
-    filtered_df = df[df[column].isin(frequent_values)]
+    # Keep only rows with frequently occurring values (missing values are dropped)
+    filtered_df = df[np.append(value_counts >= min_count, False)[codes]]
     
     return filtered_df
 
@@ -470,7 +744,7 @@ def clean_models_with_list_optimized(df: pd.DataFrame, model_column: str = 'mode
         dict: Simple summary
     """
     print("Starting optimized model cleaning...")
-    df_clean = df.copy()
+    df_clean = df
     models_by_manufacturer = _load_models_by_manufacturer()
 
     if not models_by_manufacturer:
@@ -483,62 +757,39 @@ def clean_models_with_list_optimized(df: pd.DataFrame, model_column: str = 'mode
         }
         return df_clean, summary
 
-    # Create comprehensive lookup dictionaries - this is done once
+    # Create comprehensive lookup dictionaries - this is done once per process
     print("Creating optimized lookup tables...")
-    
-    # Direct lookup for exact matches
-    exact_match_dict = {}
-    contains_match_dict = {}
-    prefix_match_dict = {}
-    
-    for manufacturer, models in models_by_manufacturer.items():
-        for model in models:
-            # Create variations for this model
-            variations = _create_model_variations(model)
-            
-            for variation in variations:
-                # Normalize the variation
-                normalized_variation = _normalize_text(variation)
-                if normalized_variation:
-                    # Store for exact matches
-                    exact_match_dict[normalized_variation] = (model, manufacturer)
-                    
-                    # Store for contains matches (sorted by length desc for priority)
-                    if normalized_variation not in contains_match_dict:
-                        contains_match_dict[normalized_variation] = []
-                    contains_match_dict[normalized_variation].append((model, manufacturer))
-    
-    # Sort contains matches by length (longer matches first)
-    for key in contains_match_dict:
-        contains_match_dict[key] = sorted(contains_match_dict[key], key=lambda x: len(x[0]), reverse=True)
+    exact_match_dict, contains_match_dict, variation_rank, max_variation_words = _build_model_lookup_tables()
     
     # Get unique model texts to process (avoid duplicate processing)
     print("Processing unique model values...")
-    unique_models = df_clean[model_column].dropna().unique()
+    codes, unique_models = pd.factorize(df_clean[model_column])
+    
+    # Normalize all unique model texts in one batch
+    normalized_texts = _normalize_texts(unique_models)
     
-    # Create a mapping from original text to cleaned result
-    text_to_result = {}
+    # Strategy 1: Direct exact match (fastest), resolved for all unique texts in one hashed lookup
+    exact_positions = pd.Index(list(exact_match_dict)).get_indexer(normalized_texts)
+    exact_results = list(exact_match_dict.values())
+    unique_matched_models = np.array([model for model, _ in exact_results] + [None], dtype=object)[exact_positions]
+    unique_matched_manufacturers = np.array([manufacturer for _, manufacturer in exact_results] + [None],
+                                            dtype=object)[exact_positions]
     
-    # Process unique models with progress bar
-    for original_text in tqdm(unique_models, desc="Processing unique models"):
-        normalized_text = _normalize_text(original_text)
+    # Process the remaining unique models with progress bar
+    for position in tqdm(np.flatnonzero(exact_positions < 0), desc="Processing unique models"):
+        normalized_text = normalized_texts[position]
         matched_model, matched_manufacturer = None, None
         
-        # Strategy 1: Direct exact match (fastest)
-        if normalized_text in exact_match_dict:
-            matched_model, matched_manufacturer = exact_match_dict[normalized_text]
-        
         # Strategy 2: Contains match (if no exact match)
-        elif normalized_text:
-            # Check if any known model is contained in the text
-            for model_variation in sorted(contains_match_dict.keys(), key=len, reverse=True):
-                if re.search(r'\b' + re.escape(model_variation) + r'\b', normalized_text):
-                    matched_model, matched_manufacturer = contains_match_dict[model_variation][0]
-                    break
+        if normalized_text:
+            # Check if any known model is contained in the text (as whole words)
+            words = normalized_text.split()
+            model_variation = _best_variation(words, variation_rank, max_variation_words)
+            if model_variation is not None:
+                matched_model, matched_manufacturer = contains_match_dict[model_variation][0]
             
             # Strategy 3: Manufacturer prefix match (if no contains match)
             if not matched_model:
-                words = normalized_text.split()
                 if len(words) >= 2:
                     remaining_text = ' '.join(words[1:])
                     if remaining_text in exact_match_dict:
@@ -546,60 +797,52 @@ def clean_models_with_list_optimized(df: pd.DataFrame, model_column: str = 'mode
             
             # Strategy 4: Starts with match (if no prefix match)
             if not matched_model:
-                for model_variation in sorted(contains_match_dict.keys(), key=len, reverse=True):
-                    if normalized_text.startswith(model_variation + ' '):
-                        matched_model, matched_manufacturer = contains_match_dict[model_variation][0]
-                        break
+                model_variation = _best_variation(words, variation_rank, max_variation_words, prefix_only=True)
+                if model_variation is not None:
+                    matched_model, matched_manufacturer = contains_match_dict[model_variation][0]
         
         # Store the result
-        text_to_result[original_text] = (matched_model, matched_manufacturer)
+        unique_matched_models[position] = matched_model
+        unique_matched_manufacturers[position] = matched_manufacturer
     
     # Apply the mapping to the DataFrame (vectorized operation)
     print("Applying results to DataFrame...")
     
-    # Create a function to map the results
-    def map_result(text):
-        if pd.isna(text):
-            return None, None
-        return text_to_result.get(text, (None, None))
-    
-    # Apply the mapping
-    results = df_clean[model_column].map(map_result)
-    
-    # Extract matched models and manufacturers
-    matched_models = [result[0] if result else None for result in results]
-    matched_manufacturers = [result[1] if result else None for result in results]
+    # Gather the per-unique results by code (missing models get None)
+    matched_models = pd.Series(np.append(unique_matched_models, None)[codes], index=df_clean.index)
+    matched_manufacturers = pd.Series(np.append(unique_matched_manufacturers, None)[codes], index=df_clean.index)
     
     # Create boolean mask for rows with valid matches
-    mask = pd.Series(matched_models, index=df_clean.index).notna()
+    mask = matched_models.notna()
     
-    # Track original values for comparison
-    original_models = df_clean[model_column].copy()
-    original_manufacturers = df_clean[manufacturer_column].copy()
+    # Original values for comparison (no copy needed: the updated columns are new objects)
+    original_models = df_clean[model_column]
+    original_manufacturers = df_clean[manufacturer_column]
     
-    # Count changes
+    # Count changes; only the matched rows can change
     models_updated = 0
     manufacturers_updated = 0
+    changed_rows = np.zeros(len(df_clean), dtype=bool)
     
     if mask.any():
         print(f"Found {mask.sum()} models to update.")
         
-        # Update using vectorized operations - fix the indexing issue
-        matched_models_series = pd.Series(matched_models, index=df_clean.index)
-        matched_manufacturers_series = pd.Series(matched_manufacturers, index=df_clean.index)
+        # Count actual changes on the matched rows (a missing original value counts as changed)
+        matched_rows = mask.to_numpy()
+        model_changed = (original_models.to_numpy(dtype=object, na_value=None)[matched_rows]
+                         != matched_models.to_numpy(dtype=object)[matched_rows])
+        manufacturer_changed = (original_manufacturers.to_numpy(dtype=object, na_value=None)[matched_rows]
+                                != matched_manufacturers.to_numpy(dtype=object)[matched_rows])
+        models_updated = int(model_changed.sum())
+        manufacturers_updated = int(manufacturer_changed.sum())
+        changed_rows[matched_rows] = model_changed | manufacturer_changed
         
-        # Count actual changes
-        models_updated = (original_models != matched_models_series).sum()
-        manufacturers_updated = (original_manufacturers != matched_manufacturers_series).sum()
-        
-        df_clean.loc[mask, model_column] = matched_models_series[mask]
-        df_clean.loc[mask, manufacturer_column] = matched_manufacturers_series[mask]
+        df_clean = df_clean.assign(**{
+            model_column: original_models.mask(mask, matched_models),
+            manufacturer_column: original_manufacturers.mask(mask, matched_manufacturers)
+        })
     else:
         print("No models were updated.")
-
-    # Calculate total changes
-    changed_rows = (original_models != df_clean[model_column]) | \
-                   (original_manufacturers != df_clean[manufacturer_column])
     
     print(f"Step: clean_models_with_list_optimized")
     print(f"Total rows modified: {changed_rows.sum()}")
@@ -618,7 +861,7 @@ def clean_models_with_list_optimized(df: pd.DataFrame, model_column: str = 'mode
     # Create summary
     summary = {
         'total_rows': len(df_clean),
-        'rows_modified': changed_rows.sum(),
+        'rows_modified': int(changed_rows.sum()),
         'models_updated': models_updated,
         'manufacturers_updated': manufacturers_updated,
         'unique_models_processed': len(unique_models),
@@ -19,6 +19,56 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+def _odometer_range_masks(odometer, min_miles, max_miles):
+    """
+    Build the null, below-minimum and above-maximum masks of an odometer column
+    
+    The column is converted to a float array once (missing values become NaN), so
+    every comparison is a plain numpy pass. NaN compares False, so null values are
+    never below or above the range.
+    
+    Parameters:
+    odometer (pd.Series): Odometer column
+    min_miles (float): Minimum acceptable mileage
+    max_miles (float): Maximum acceptable mileage
+    
+    Returns:
+    np.ndarray: Null values
+    np.ndarray: Values below min_miles
+    np.ndarray: Values above max_miles
+    """
+    values = odometer.to_numpy(dtype='float64', na_value=np.nan)
+    return np.isnan(values), values < min_miles, values > max_miles
+
+
+def _odometer_stats(odometer):
+    """
+    Count, mean, standard deviation, min and max of the non-null odometer values
+    
+    These are the describe() statistics the summaries report, without the sort
+    describe() does for the quartiles.
+    
+    Parameters:
+    odometer (pd.Series): Odometer column
+    
+    Returns:
+    dict: Statistics by name (NaN for an empty column, std NaN for a single value)
+    """
+    values = odometer.to_numpy(dtype='float64', na_value=np.nan)
+    values = values[~np.isnan(values)]
+    
+    if len(values) == 0:
+        return {'count': 0.0, 'mean': np.nan, 'std': np.nan, 'min': np.nan, 'max': np.nan}
+    
+    return {
+        'count': float(len(values)),
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if len(values) > 1 else np.nan,
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+
+
 def remove_extreme_odometer(df, odometer_col='odometer'):
     """
     Remove extreme values from odometer column
@@ -32,32 +82,22 @@ def remove_extreme_odometer(df, odometer_col='odometer'):
     dict: Summary of removal results
     """
     
-    # Make a copy to avoid modifying original
-    df_cleaned = df.copy()
-    
     # Store original info
-    original_count = len(df_cleaned)
-    original_stats = df_cleaned[odometer_col].describe()
-    
-    # Remove null values first
-    df_cleaned = df_cleaned[df_cleaned[odometer_col].notna()].copy()
+    original_count = len(df)
+    original_stats = _odometer_stats(df[odometer_col])
     
     # Set reasonable odometer limits
     min_odometer = 0        # Can't have negative mileage
     max_odometer = 500000   # Maximum reasonable odometer reading (500k miles)
     
-    # Find extreme values
-    extreme_low = df_cleaned[df_cleaned[odometer_col] < min_odometer]
-    extreme_high = df_cleaned[df_cleaned[odometer_col] > max_odometer]
+    # Find null and extreme values in one pass over the column
+    null_mask, extreme_low, extreme_high = _odometer_range_masks(df[odometer_col], min_odometer, max_odometer)
     
-    # Remove extreme values
-    df_cleaned = df_cleaned[
-        (df_cleaned[odometer_col] >= min_odometer) & 
-        (df_cleaned[odometer_col] <= max_odometer)
-    ].copy()
+    # Remove null and extreme values
+    df_cleaned = df[~(null_mask | extreme_low | extreme_high)]
     
     # Calculate statistics after cleaning
-    cleaned_stats = df_cleaned[odometer_col].describe()
+    cleaned_stats = _odometer_stats(df_cleaned[odometer_col])
     
     # Create summary
     removal_summary = {
@@ -67,11 +107,11 @@ def remove_extreme_odometer(df, odometer_col='odometer'):
         'removal_percentage': round((original_count - len(df_cleaned)) / original_count * 100, 2),
         'min_threshold': min_odometer,
         'max_threshold': max_odometer,
-        'extreme_low_count': len(extreme_low),
-        'extreme_high_count': len(extreme_high),
-        'null_count': df[odometer_col].isnull().sum(),
-        'original_stats': original_stats.to_dict(),
-        'cleaned_stats': cleaned_stats.to_dict()
+        'extreme_low_count': int(extreme_low.sum()),
+        'extreme_high_count': int(extreme_high.sum()),
+        'null_count': null_mask.sum(),
+        'original_stats': original_stats,
+        'cleaned_stats': cleaned_stats
     }
     
     return df_cleaned, removal_summary
@@ -97,22 +137,16 @@ def validate_odometer_values(df, odometer_col='odometer', min_miles=0, max_miles
     original_range = (df[odometer_col].min(), df[odometer_col].max())
     
     # Find invalid values
-    null_mask = df[odometer_col].isnull()
-    below_min_mask = df[odometer_col] < min_miles
-    above_max_mask = df[odometer_col] > max_miles
+    null_mask, below_min_mask, above_max_mask = _odometer_range_masks(df[odometer_col], min_miles, max_miles)
     
     invalid_values = {
         'null_values': null_mask.sum(),
-        'below_minimum': below_min_mask.sum(),
-        'above_maximum': above_max_mask.sum()
+        'below_minimum': int(below_min_mask.sum()),
+        'above_maximum': int(above_max_mask.sum())
     }
     
     # Filter to keep only valid values
-    valid_df = df[
-        (df[odometer_col].notna()) & 
-        (df[odometer_col] >= min_miles) & 
-        (df[odometer_col] <= max_miles)
-    ].copy()
+    valid_df = df[~(null_mask | below_min_mask | above_max_mask)]
     
     # Calculate new range
     if len(valid_df) > 0:
@@ -150,13 +184,14 @@ def remove_odometer_outliers_iqr(df, odometer_col='odometer', multiplier=1.5):
     dict: Summary of IQR outlier removal
     """
     
-    # Remove null values first
-    df_clean = df[df[odometer_col].notna()].copy()
-    original_count = len(df_clean)
+    # Null values are left out of the quantiles and of the result
+    odometer = df[odometer_col]
+    values = odometer.to_numpy(dtype='float64', na_value=np.nan)
+    null_mask = np.isnan(values)
+    original_count = int((~null_mask).sum())
     
-    # Calculate IQR
-    Q1 = df_clean[odometer_col].quantile(0.25)
-    Q3 = df_clean[odometer_col].quantile(0.75)
+    # Calculate IQR (both quartiles from a single sort)
+    Q1, Q3 = np.percentile(values[~null_mask], [25, 75]) if original_count else (np.nan, np.nan)
     IQR = Q3 - Q1
     
     # Define outlier bounds
@@ -167,14 +202,12 @@ def remove_odometer_outliers_iqr(df, odometer_col='odometer', multiplier=1.5):
     lower_bound = max(0, lower_bound)
     
     # Count outliers
-    outliers_below = (df_clean[odometer_col] < lower_bound).sum()
-    outliers_above = (df_clean[odometer_col] > upper_bound).sum()
+    _, below_mask, above_mask = _odometer_range_masks(odometer, lower_bound, upper_bound)
+    outliers_below = below_mask.sum()
+    outliers_above = above_mask.sum()
     
-    # Remove outliers
-    df_clean = df_clean[
-        (df_clean[odometer_col] >= lower_bound) & 
-        (df_clean[odometer_col] <= upper_bound)
-    ].copy()
+    # Remove null values and outliers
+    df_clean = df[~(null_mask | below_mask | above_mask)]
     
     # Create summary
     iqr_summary = {
@@ -210,11 +243,17 @@ def process_odometer_column(df, odometer_col='odometer', min_miles=0, max_miles=
     dict: Summary of all operations
     """
     
+    # Both steps run on the odometer column alone, with a positional index, so the
+    # full frame is filtered only once at the end (with the rows kept by both steps)
+    odometer_df = df[[odometer_col]].reset_index(drop=True)
+    
     print("Step 1: Removing extreme odometer values...")
-    df_cleaned, removal_summary = remove_extreme_odometer(df, odometer_col)
+    odometer_cleaned, removal_summary = remove_extreme_odometer(odometer_df, odometer_col)
     
     print("\nStep 2: Validating odometer values...")
-    df_final, validation_summary = validate_odometer_values(df_cleaned, odometer_col, min_miles, max_miles)
+    odometer_final, validation_summary = validate_odometer_values(odometer_cleaned, odometer_col, min_miles, max_miles)
+    
+    df_final = df.iloc[odometer_final.index.to_numpy()]
     
     # Combined summary
     combined_summary = {
@@ -262,16 +301,25 @@ def preview_odometer_cleaning(df, odometer_col='odometer'):
     print(f"Values > 500,000: {extreme_high:,}")
     print(f"Values < 0: {extreme_low:,}")
     
+    # All percentiles (the quartiles included) from a single sort of the non-null values
+    values = df[odometer_col].to_numpy(dtype='float64', na_value=np.nan)
+    values = values[~np.isnan(values)]
+    percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+    if len(values) > 0:
+        percentile_values = dict(zip(percentiles, np.percentile(values, percentiles)))
+    else:
+        percentile_values = dict.fromkeys(percentiles, np.nan)
+    
     # Show distribution
     print(f"\nPercentile distribution:")
-    for p in [1, 5, 10, 25, 50, 75, 90, 95, 99]:
-        value = df[odometer_col].quantile(p/100)
+    for p in percentiles:
+        value = percentile_values[p]
         print(f"  {p}th percentile: {value:,.0f}")
     
     # Show potential outliers using IQR
-    if df[odometer_col].notna().sum() > 0:
-        Q1 = df[odometer_col].quantile(0.25)
-        Q3 = df[odometer_col].quantile(0.75)
+    if len(values) > 0:
+        Q1 = percentile_values[25]
+        Q3 = percentile_values[75]
         IQR = Q3 - Q1
         lower_bound = max(0, Q1 - 1.5 * IQR)
         upper_bound = Q3 + 1.5 * IQR
@@ -307,12 +355,12 @@ def validate_odometer(df, odometer_column='odometer', min_miles=0, max_miles=500
     original_rows = len(df)
     
     # Find invalid values (outside range)
-    invalid_mask = (df[odometer_column] < min_miles) | (df[odometer_column] > max_miles)
+    _, below_min_mask, above_max_mask = _odometer_range_masks(df[odometer_column], min_miles, max_miles)
+    invalid_mask = below_min_mask | above_max_mask
     invalid_count = invalid_mask.sum()
     
     # Keep only valid values (within range or NaN)
-    df_clean = df[((df[odometer_column] >= min_miles) & (df[odometer_column] <= max_miles)) | 
-                  df[odometer_column].isna()]
+    df_clean = df[~invalid_mask]
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
@@ -1,4 +1,56 @@
 import pandas as pd 
+import numpy as np
+
+
+def _group_modes(df, group_cols, value_col):
+    """
+    Most common value of a column per group, from one count per (group, value) pair
+    
+    Matches x.mode().iloc[0] on each group: ties go to the smallest value and
+    groups with only missing values get NaN. Groups with a missing key are left out.
+    
+    Parameters:
+    df (pd.DataFrame): Input DataFrame
+    group_cols (list): Names of the columns to group by
+    value_col (str): Name of the column to take the mode of
+    
+    Returns:
+    pd.DataFrame: Group keys (group_cols) and their mode (value_col), one row per group
+    """
+    groups = df.groupby(group_cols, observed=True)[value_col].size().index.to_frame(index=False)
+    
+    # Missing values are not counted (dropna), so they never win
+    counts = df.groupby(group_cols + [value_col], observed=True).size().rename('_count').reset_index()
+    modes = counts.sort_values(['_count', value_col], ascending=[False, True], kind='stable')
+    modes = modes.drop_duplicates(group_cols)[group_cols + [value_col]]
+    
+    return groups.merge(modes, how='left', on=group_cols)
+
+
+def _fill_from_group_modes(df, values, group_cols, modes):
+    """
+    Fill missing values with the mode of their group
+    
+    Parameters:
+    df (pd.DataFrame): DataFrame holding the group columns
+    values (pd.Series): Column to fill (aligned with df)
+    group_cols (list): Names of the group columns
+    modes (pd.DataFrame): Modes per group, as returned by _group_modes
+    
+    Returns:
+    pd.Series: values with the missing entries filled where their group has a mode
+    """
+    null_rows = values.isna().to_numpy()
+    
+    # Left merge keeps the order of the null rows; rows with a missing key find no group
+    fills = df.loc[null_rows, group_cols].merge(modes, how='left', on=group_cols)[values.name]
+    
+    other = np.full(len(values), None, dtype=object)
+    other[null_rows] = fills.to_numpy(dtype=object, na_value=None)
+    
+    return values.where(~null_rows, other)
+
+
 def fill_paint_color_nulls(df, paint_color_col='paint_color', manufacturer_col='manufacturer', state_col='state'):
     """
     Fill null values in paint_color column based on most common color 
@@ -15,54 +67,31 @@ def fill_paint_color_nulls(df, paint_color_col='paint_color', manufacturer_col='
     dict: Summary of filling operation
     """
     
-    # Make a copy to avoid modifying original
-    df_filled = df.copy()
+    paint_colors = df[paint_color_col]
     
     # Count nulls before filling
-    nulls_before = df_filled[paint_color_col].isnull().sum()
-    total_rows = len(df_filled)
+    nulls_before = paint_colors.isnull().sum()
+    total_rows = len(df)
     
     # Step 1: Fill based on manufacturer + state combination
-    manufacturer_state_mode = df_filled.groupby([manufacturer_col, state_col])[paint_color_col].agg(
-        lambda x: x.mode().iloc[0] if len(x.mode()) > 0 and not x.mode().empty else None
-    ).to_dict()
-    
-    # Create mask for nulls
-    null_mask = df_filled[paint_color_col].isnull()
-    
-    # Fill nulls with manufacturer-state mode
-    for idx in df_filled[null_mask].index:
-        manufacturer = df_filled.loc[idx, manufacturer_col]
-        state = df_filled.loc[idx, state_col]
-        
-        if (manufacturer, state) in manufacturer_state_mode:
-            mode_color = manufacturer_state_mode[(manufacturer, state)]
-            if pd.notna(mode_color):
-                df_filled.loc[idx, paint_color_col] = mode_color
-    
-    # Step 2: Fill remaining nulls with manufacturer-only mode
-    still_null_mask = df_filled[paint_color_col].isnull()
-    manufacturer_mode = df_filled.groupby(manufacturer_col)[paint_color_col].agg(
-        lambda x: x.mode().iloc[0] if len(x.mode()) > 0 and not x.mode().empty else None
-    ).to_dict()
-    
-    for idx in df_filled[still_null_mask].index:
-        manufacturer = df_filled.loc[idx, manufacturer_col]
-        
-        if manufacturer in manufacturer_mode:
-            mode_color = manufacturer_mode[manufacturer]
-            if pd.notna(mode_color):
-                df_filled.loc[idx, paint_color_col] = mode_color
+    manufacturer_state_mode = _group_modes(df, [manufacturer_col, state_col], paint_color_col)
+    paint_colors = _fill_from_group_modes(df, paint_colors, [manufacturer_col, state_col], manufacturer_state_mode)
+    
+    # Step 2: Fill remaining nulls with manufacturer-only mode (computed after step 1)
+    df_filled = df.assign(**{paint_color_col: paint_colors})
+    manufacturer_mode = _group_modes(df_filled, [manufacturer_col], paint_color_col)
+    paint_colors = _fill_from_group_modes(df_filled, paint_colors, [manufacturer_col], manufacturer_mode)
     
     # Step 3: Fill any remaining nulls with overall most common color
-    remaining_null_mask = df_filled[paint_color_col].isnull()
-    if remaining_null_mask.sum() > 0:
-        overall_mode = df_filled[paint_color_col].mode()
+    if paint_colors.isnull().sum() > 0:
+        overall_mode = paint_colors.mode()
         if len(overall_mode) > 0:
-            df_filled.loc[remaining_null_mask, paint_color_col] = overall_mode.iloc[0]
+            paint_colors = paint_colors.fillna(overall_mode.iloc[0])
+    
+    df_filled = df.assign(**{paint_color_col: paint_colors})
     
     # Count nulls after filling
-    nulls_after = df_filled[paint_color_col].isnull().sum()
+    nulls_after = paint_colors.isnull().sum()
     filled_count = nulls_before - nulls_after
     
     # Create summary
@@ -73,7 +102,7 @@ def fill_paint_color_nulls(df, paint_color_col='paint_color', manufacturer_col='
         'filled_count': filled_count,
         'fill_percentage': round((filled_count / nulls_before * 100), 2) if nulls_before > 0 else 0,
         'manufacturer_state_combinations': len(manufacturer_state_mode),
-        'successful_combinations': sum(1 for v in manufacturer_state_mode.values() if pd.notna(v))
+        'successful_combinations': int(manufacturer_state_mode[paint_color_col].notna().sum())
     }
     
     return df_filled, filling_summary 
@@ -102,12 +131,14 @@ def validate_paint_color(df, paint_color_column='paint_color'):
     
     original_rows = len(df)
     
-    # Find invalid values
-    invalid_mask = ~df[paint_color_column].isin(valid_colors)
-    invalid_count = invalid_mask.sum()
+    # Flag the valid colors
+    valid_mask = pd.Categorical(df[paint_color_column], categories=valid_colors).codes >= 0
+    
+    # Find invalid values (null values count as invalid here)
+    invalid_count = (~valid_mask).sum()
     
     # Keep only valid values (including NaN)
-    df_clean = df[df[paint_color_column].isin(valid_colors) | df[paint_color_column].isna()]
+    df_clean = df[valid_mask | df[paint_color_column].isna().to_numpy()]
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
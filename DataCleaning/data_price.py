@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def clean_price_data(df, price_col='price'):
    """
    Clean price data by removing invalid and extreme outliers
@@ -17,17 +20,19 @@ def clean_price_data(df, price_col='price'):
    
    original_count = len(df)
    
-   # Remove invalid prices
-   df_clean = df[df[price_col] > 0].copy()  # Remove $0 prices
-   zero_price_dropped = original_count - len(df_clean)
+   # Compare on one float array (missing prices become NaN, which fails every check)
+   prices = df[price_col].to_numpy(dtype='float64', na_value=np.nan)
+   
+   # Invalid prices ($0 and missing)
+   positive_mask = prices > 0
+   zero_price_dropped = original_count - int(positive_mask.sum())
    
    # Set reasonable price limits for used cars
    min_price = 500      # Minimum reasonable car price
    max_price = 100000   # Maximum reasonable used car price
    
-   # Apply price range filtering
-   df_clean = df_clean[(df_clean[price_col] >= min_price) & 
-                       (df_clean[price_col] <= max_price)]
+   # Remove invalid and out of range prices with a single filter
+   df_clean = df[positive_mask & (prices >= min_price) & (prices <= max_price)]
    
    # Calculate statistics
    final_count = len(df_clean)
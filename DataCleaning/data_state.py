@@ -28,12 +28,14 @@ def validate_state(df, state_column='state'):
     
     original_rows = len(df)
     
-    # Find invalid values
-    invalid_mask = ~df[state_column].isin(valid_states)
-    invalid_count = invalid_mask.sum()
+    # Flag the valid states
+    valid_mask = pd.Categorical(df[state_column], categories=valid_states).codes >= 0
+    
+    # Find invalid values (null values count as invalid here)
+    invalid_count = (~valid_mask).sum()
     
     # Keep only valid values (including NaN)
-    df_clean = df[df[state_column].isin(valid_states) | df[state_column].isna()]
+    df_clean = df[valid_mask | df[state_column].isna().to_numpy()]
     
     final_rows = len(df_clean)
     rows_dropped = original_rows - final_rows
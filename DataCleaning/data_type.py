@@ -1,3 +1,38 @@
+import pandas as pd
+import numpy as np
+
+from DataCleaning.data_cleaning import count_codes, validate_membership
+
+
+# Valid type values based on the dataset (all lowercase for standardization)
+VALID_TYPES = (
+    'sedan', 'suv', 'pickup', 'truck', 'other', 'coupe', 
+    'hatchback', 'wagon', 'van', 'convertible', 'minivan', 
+    'bus', 'offroad'
+)
+
+
+def _lowercase(values):
+    """
+    Lowercase a string column, keeping a categorical column categorical
+    
+    Categorical columns are lowered once per category and re-coded, since lowered
+    categories can coincide (e.g. 'SUV' and 'suv').
+    
+    Parameters:
+    values (pd.Series): String column
+    
+    Returns:
+    pd.Series: Lowercased values
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.str.lower()
+    
+    label_codes, new_categories = pd.factorize(values.cat.categories.str.lower())
+    new_codes = np.append(label_codes, -1)[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=new_categories), index=values.index)
+
+
 def drop_na_drive_type(df, drive_column='drive', type_column='type'):
     """
     Drop rows where both drive and type columns are missing
@@ -34,7 +69,7 @@ def drop_na_drive_type(df, drive_column='drive', type_column='type'):
     
     return df_clean, summary
 
-def validate_type_values(df, type_col='type', standardize_case=True):
+def validate_type_values(df, type_col='type', standardize_case=True, collect_stats=True):
     """
     Validate that type column contains only valid vehicle types and return filtered DataFrame
     
@@ -42,60 +77,29 @@ def validate_type_values(df, type_col='type', standardize_case=True):
     df (pd.DataFrame): Input DataFrame
     type_col (str): Name of the type column
     standardize_case (bool): Whether to convert all values to lowercase for standardization
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
     
     Returns:
     pd.DataFrame: Filtered DataFrame with only valid type values
     dict: Summary of validation results
     """
     
-    # Valid type values based on your dataset (all lowercase for standardization)
-    valid_values = [
-        'sedan', 'suv', 'pickup', 'truck', 'other', 'coupe', 
-        'hatchback', 'wagon', 'van', 'convertible', 'minivan', 
-        'bus', 'offroad'
-    ]
-    
-    # Store original info
-    original_count = len(df)
-    original_values = df[type_col].value_counts().to_dict()
-    
-    # Create working copy to avoid modifying original
-    work_df = df.copy()
-    
     # Standardize case if requested
+    work_df = df
     if standardize_case:
-        work_df[type_col] = work_df[type_col].str.lower()
-    
-    # Find invalid values (after case standardization)
-    invalid_mask = ~work_df[type_col].isin(valid_values)
-    invalid_values = work_df[invalid_mask][type_col].value_counts().to_dict()
-    
-    # Check for null values
-    null_count = work_df[type_col].isnull().sum()
+        work_df = df.assign(**{type_col: _lowercase(df[type_col])})
     
-    # Filter DataFrame to keep only valid values
-    valid_df = work_df[work_df[type_col].isin(valid_values)].copy()
+    valid_df, validation_summary = validate_membership(work_df, type_col, VALID_TYPES, collect_stats)
     
-    # Remove null values as well
-    valid_df = valid_df[valid_df[type_col].notna()].copy()
+    if validation_summary is not None:
+        # Report the original values as they were before case standardization
+        if standardize_case:
+            original = df[type_col].astype('category')
+            validation_summary['original_value_counts'] = count_codes(original.cat.codes.to_numpy(), original.cat.categories)
+        validation_summary['case_standardized'] = standardize_case
     
-    # Create summary
-    validation_summary = {
-        'total_rows': original_count,
-        'valid_rows': len(valid_df),
-        'dropped_rows': original_count - len(valid_df),
-        'drop_percentage': round((original_count - len(valid_df)) / original_count * 100, 2),
-        'valid_values': valid_values,
-        'original_value_counts': original_values,
-        'invalid_values': invalid_values,
-        'null_values': null_count,
-        'validation_passed': len(invalid_values) == 0 and null_count == 0,
-        'case_standardized': standardize_case
-    }
-    
-    return valid_df, validation_summary 
-
-
+    return valid_df, validation_summary
 
 def replace_values(df, column_name, replacement_dict):
     """
@@ -111,15 +115,31 @@ def replace_values(df, column_name, replacement_dict):
     dict: Simple summary
     """
     
-    df_clean = df.copy()
-    
-    # Count affected rows before replacement
-    affected_rows = 0
-    for old_value in replacement_dict.keys():
-        affected_rows += (df_clean[column_name] == old_value).sum()
-    
-    # Do the replacement
-    df_clean[column_name] = df_clean[column_name].replace(replacement_dict)
+    column = df[column_name]
+    
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Categorical input: replace the categories only and re-code the rows (a replaced
+        # category can coincide with an existing one, so the codes are rebuilt)
+        codes = column.cat.codes.to_numpy()
+        categories = column.cat.categories
+        
+        affected_rows = int(np.append(categories.isin(list(replacement_dict)), False)[codes].sum())
+        
+        mapped = categories.map(replacement_dict)
+        label_codes, new_categories = pd.factorize(np.where(mapped.isna(), categories, mapped))
+        replaced = pd.Series(
+            pd.Categorical.from_codes(np.append(label_codes, -1)[codes], categories=new_categories),
+            index=column.index
+        )
+    else:
+        # Find affected rows with one membership pass instead of one comparison per old value
+        affected_mask = column.isin(list(replacement_dict))
+        affected_rows = int(affected_mask.sum())
+        
+        # Do the replacement: only the affected rows are looked up in the dict
+        replaced = column.mask(affected_mask, column[affected_mask].map(replacement_dict))
+    
+    df_clean = df.assign(**{column_name: replaced})
     
     # Create simple summary
     summary = {
@@ -131,9 +151,6 @@ def replace_values(df, column_name, replacement_dict):
     return df_clean, summary
 
 
-
-
-
 def fill_type_from_model(df, model_column='model', type_column='type'):
     """
     Fill missing type values based on most common type for each model
@@ -151,18 +168,19 @@ def fill_type_from_model(df, model_column='model', type_column='type'):
     dict: Simple summary
     """
     
-    df_clean = df.copy()
-    
     # Count missing values before filling
-    missing_before = df_clean[type_column].isna().sum()
+    missing_before = df[type_column].isna().sum()
     
-    # Create mapping of model to most common type
-    model_type_mapping = df_clean.groupby(model_column)[type_column].agg(
-        lambda x: x.mode()[0] if not x.mode().empty else None
-    )
+    # Create mapping of model to most common type from one (model, type) count instead of
+    # a mode per group: ties go to the smallest type, as with x.mode()[0]. Models with
+    # only missing types (and unused categories of a categorical model column) get no entry
+    type_counts = df.groupby([model_column, type_column], observed=True).size().rename('_count').reset_index()
+    most_common = type_counts.sort_values(['_count', type_column], ascending=[False, True], kind='stable')
+    most_common = most_common.drop_duplicates(model_column)
+    model_type_mapping = pd.Series(most_common[type_column].to_numpy(), index=most_common[model_column])
     
     # Fill missing values using the mapping
-    df_clean[type_column] = df_clean[type_column].fillna(df_clean[model_column].map(model_type_mapping))
+    df_clean = df.assign(**{type_column: df[type_column].fillna(df[model_column].map(model_type_mapping))})
     
     # Count missing values after filling
     missing_after = df_clean[type_column].isna().sum()
@@ -174,7 +192,7 @@ def fill_type_from_model(df, model_column='model', type_column='type'):
         'missing_before': missing_before,
         'missing_after': missing_after,
         'values_filled': values_filled,
-        'mapping_created': len(model_type_mapping.dropna())
+        'mapping_created': len(model_type_mapping)
     }
     
     return df_clean, summary 
@@ -1,5 +1,8 @@
 import pandas as pd
-def validate_years(df, year_column='year', min_year=1990):
+import numpy as np
+
+
+def validate_years(df, year_column='year', min_year=1990, collect_stats=True):
     """
     Validate and filter DataFrame to keep only rows with years >= min_year
     
@@ -7,28 +10,32 @@ def validate_years(df, year_column='year', min_year=1990):
     df (pd.DataFrame): Input DataFrame
     year_column (str): Name of the year column
     min_year (int): Minimum year to keep (default: 1990)
+    collect_stats (bool): Whether to build the summary. If False, None is returned
+                          in its place and the summary scans are skipped.
     
     Returns:
     pd.DataFrame: Filtered DataFrame with only valid years
     dict: Summary of validation results
     """
     
+    # Compare on one float array (missing years become NaN)
+    years = df[year_column].to_numpy(dtype='float64', na_value=np.nan)
+    
+    # Filter DataFrame to keep only valid years (null years compare False, so they are dropped as well)
+    filtered_df = df[years >= min_year]
+    
+    if not collect_stats:
+        return filtered_df, None
+    
     # Store original info
     original_count = len(df)
     original_year_range = (df[year_column].min(), df[year_column].max())
     
     # Find invalid years (older than min_year)
-    invalid_years_mask = df[year_column] < min_year
-    invalid_years = df[invalid_years_mask][year_column].value_counts().sort_index()
+    invalid_years = df.loc[years < min_year, year_column].value_counts().sort_index()
     
     # Also check for null values
-    null_years = df[year_column].isnull().sum()
-    
-    # Filter DataFrame to keep only valid years
-    filtered_df = df[df[year_column] >= min_year].copy()
-    
-    # Remove null values as well
-    filtered_df = filtered_df[filtered_df[year_column].notna()].copy()
+    null_years = np.isnan(years).sum()
     
     # Calculate new year range
     if len(filtered_df) > 0:
@@ -188,6 +188,9 @@ class GCSDataOperations:
         """
         Read Parquet file from GCS as pandas DataFrame
         
+        Columns are read with pyarrow-backed dtypes (e.g. string[pyarrow]) by default,
+        pass dtype_backend='numpy_nullable' or similar to override.
+        
         Args:
             bucket_name: Name of the bucket
             blob_name: Name of the Parquet file in GCS
@@ -200,8 +203,15 @@ class GCSDataOperations:
             bucket = self.client.bucket(bucket_name)
             blob = bucket.blob(blob_name)
             
+            # Default Parquet parameters (Arrow-backed columns instead of NumPy/object dtypes)
+            parquet_params = {
+                'engine': 'pyarrow',
+                'dtype_backend': 'pyarrow'
+            }
+            parquet_params.update(kwargs)
+            
             parquet_bytes = blob.download_as_bytes()
-            df = pd.read_parquet(BytesIO(parquet_bytes), **kwargs)
+            df = pd.read_parquet(BytesIO(parquet_bytes), **parquet_params)
             
             logger.info(f"Parquet read successfully ({len(df)} rows, {len(df.columns)} columns)")
             return df
@@ -1,12 +1,19 @@
+from collections.abc import Mapping
+
+
 def print_summary(summary, title="Summary"):
     """
     Print all key-value pairs from a summary dictionary
     
     Parameters:
-    summary (dict): Summary dictionary from validation functions
+    summary (dict): Summary dictionary from validation functions, or None when
+                    the function was called with collect_stats=False (nothing is printed)
     title (str): Title for the summary output
     """
     
+    if summary is None:
+        return
+    
     print(f"{title}")
     print("=" * len(title))
     
@@ -23,9 +30,9 @@ def print_summary(summary, title="Summary"):
             else:
                 # Regular list
                 formatted_value = str(value)
-        elif isinstance(value, dict):
-            # For dictionaries, show in a readable format
-            formatted_value = str(value)
+        elif isinstance(value, Mapping):
+            # For dictionaries (and read-only mappings), show in a readable format
+            formatted_value = str(dict(value))
         else:
             # For numbers, add comma formatting if it's a large number
             if isinstance(value, int) and value >= 1000: